@@ -287,6 +287,126 @@ CACHES = {
     },
 }
 
+# seconds the options of the select filters of data tables are cached, they
+# are invalidated on changes anyway, see `mal2.utils.FilterOptions`
+FILTER_OPTIONS_CACHE_TIMEOUT = 24 * 3600
+
+################################################################################
+# VERDICT INDEX
+
+# in-memory index of the verdicts of all website hosts per process, see
+# `mal2_db.utils.VerdictIndex`
+VERDICT_INDEX_ENABLED = True
+
+# seconds between two incremental refreshes and two full rebuilds
+VERDICT_INDEX_REFRESH_INTERVAL = 30
+VERDICT_INDEX_REBUILD_INTERVAL = 3600
+
+# seconds the incremental refresh looks back before the last refresh to catch
+# changes of transactions that committed late
+VERDICT_INDEX_REFRESH_OVERLAP = 60
+
+# number of changed hosts that are merged into the sorted index at once
+VERDICT_INDEX_MAX_DELTA = 10000
+
+# hard memory cap in bytes, the index is disabled if it grows larger (every
+# host needs 8 bytes, i.e. 64 MiB hold 8M hosts)
+VERDICT_INDEX_MAX_SIZE = 64 * 1024 * 1024
+
+################################################################################
+# BLOCKLIST
+
+# snapshots and deltas of the fake shop and counterfeiter hosts, served with
+# "X-Sendfile", see `mal2_db.utils.publish_blocklist()`
+BLOCKLIST_PATH = os.path.join(BASE_DIR, "blocklist")
+
+# number of previous versions with a delta to the latest version
+BLOCKLIST_DELTA_VERSIONS = 30
+
+# bloom filter of the fake shop and counterfeiter hosts for clients, see
+# `mal2.utils.BloomFilter` for the format
+BLOOM_FILTER_PATH = os.path.join(BLOCKLIST_PATH, "hosts.bloom")
+BLOOM_FILTER_ERROR_RATE = 0.001
+
+# the filter is built with room for BLOOM_FILTER_GROWTH times the current
+# number of hosts, it is rebuilt as soon as more hosts are added
+BLOOM_FILTER_GROWTH = 2
+BLOOM_FILTER_MIN_CAPACITY = 10000
+
+################################################################################
+# SCREENSHOT JOBS
+
+# screenshots are taken by the "process_screenshots" command, see
+# `mal2_db.utils.run_screenshot_workers()`
+SCREENSHOT_JOB_CONCURRENCY = 2
+
+# seconds a worker waits before it looks for new jobs again
+SCREENSHOT_JOB_POLL_INTERVAL = 5
+
+# a failed job is retried after SCREENSHOT_JOB_BACKOFF * 2 ** (attempts - 1)
+# seconds until it failed SCREENSHOT_JOB_MAX_ATTEMPTS times
+SCREENSHOT_JOB_MAX_ATTEMPTS = 5
+SCREENSHOT_JOB_BACKOFF = 60
+
+# seconds after which a running job is handed to another worker, e.g. if its
+# worker died
+SCREENSHOT_JOB_TIMEOUT = 300
+
+# a recapture asks the website with a conditional request first and keeps the
+# screenshot if the normalized HTML did not change since the last recapture
+SCREENSHOT_SKIP_UNCHANGED = True
+
+# screenshots of the same host taken at the same time by all workers, so a
+# bulk recapture does not hammer a single site
+SCREENSHOT_JOB_HOST_CONCURRENCY = 1
+
+# warm headless Chrome sessions per worker process, a session is replaced
+# after SCREENSHOT_BROWSER_MAX_PAGES pages or if it crashed
+SCREENSHOT_BROWSER_POOL_SIZE = SCREENSHOT_JOB_CONCURRENCY
+SCREENSHOT_BROWSER_MAX_PAGES = 50
+
+# seconds a page may take to load
+SCREENSHOT_PAGE_LOAD_TIMEOUT = 30
+
+# the screenshot is taken as soon as the page is ready: "document_ready" waits
+# for the load event only, "network_idle" also until no resource was loaded
+# for SCREENSHOT_NETWORK_IDLE_TIME seconds, both at most SCREENSHOT_MAX_WAIT
+# seconds after the navigation
+SCREENSHOT_WAIT_FOR = "network_idle"
+SCREENSHOT_NETWORK_IDLE_TIME = 0.5
+SCREENSHOT_MAX_WAIT = 5
+
+# storage of the screenshots and their derivatives, any django storage works,
+# e.g. an S3 compatible service like MinIO with private files and presigned
+# urls (see `mal2.storage.ScreenshotS3Storage`):
+#
+# SCREENSHOT_STORAGE = "mal2.storage.ScreenshotS3Storage"
+# SCREENSHOT_STORAGE_OPTIONS = {
+#     "bucket_name": "screenshots",
+#     "endpoint_url": "http://127.0.0.1:9000",
+#     "access_key": "...",
+#     "secret_key": "...",
+#     "querystring_expire": 300,
+# }
+SCREENSHOT_STORAGE = "mal2.utils.ScreenshotFileSystemStorage"
+SCREENSHOT_STORAGE_OPTIONS = {
+    "location": SCREENSHOTS_PATH,
+    "base_url": "%swebsites/screenshots/" % MEDIA_URL,
+}
+
+# WebP derivatives of every screenshot, a preview in full size and a thumbnail
+# for lists, see `mal2.utils.save_screenshot()`
+SCREENSHOT_PREVIEW_QUALITY = 80
+SCREENSHOT_THUMBNAIL_SIZE = (320, 180)
+SCREENSHOT_THUMBNAIL_QUALITY = 70
+
+# maximum Hamming distance of the perceptual hashes of two similar screenshots
+# (0 - 64), up to 7 the lookup checks 17 values per hash chunk
+SCREENSHOT_SIMILARITY_DISTANCE = 7
+
+# number of similar fake shops shown while editing a website
+SCREENSHOT_SIMILAR_WEBSITES = 10
+
 ################################################################################
 # NAVIGATION
 
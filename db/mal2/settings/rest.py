@@ -61,3 +61,15 @@ INSTALLED_APPS += [
     "rest_framework",
     "rest_framework.authtoken",
 ]
+
+################################################################################
+# LOOKUP
+
+# maximum number of urls per request of the bulk lookup endpoint
+LOOKUP_MAX_URLS = 5000
+
+################################################################################
+# CHANGE FEED
+
+# maximum number of changes per response of the change feed endpoint
+CHANGE_FEED_PAGE_SIZE = 1000
@@ -0,0 +1,24 @@
+from storages.backends.s3boto3 import S3Boto3Storage
+
+
+################################################################################
+# SCREENSHOT S3 STORAGE
+
+# not part of "mal2.utils", django-storages reads the settings on import and
+# the settings import "mal2.utils"
+
+class ScreenshotS3Storage(S3Boto3Storage):
+    """
+    Storage of the screenshots in an S3 compatible service, e.g. MinIO. The
+    files are private, `url()` returns presigned urls which expire after
+    "querystring_expire" seconds, so only users who see a page with the
+    screenshot can load it. Files are overwritten instead of being saved
+    with an alternative name, which fits content addressed names.
+    """
+
+    custom_domain = None
+    default_acl = "private"
+    bucket_acl = "private"
+    file_overwrite = True
+    querystring_auth = True
+    querystring_expire = 300
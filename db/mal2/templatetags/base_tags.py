@@ -20,7 +20,10 @@ from django.utils.html import (
 from mal2 import constants
 from mal2.utils import (
     format_file_size as utils_format_file_size,
+    get_screenshot_preview_name,
+    get_screenshot_thumbnail_name,
     remove_url_protocol as utils_remove_url_protocol,
+    screenshot_storage,
 )
 
 
@@ -157,6 +160,28 @@ def remove_url_protocol(url, *args, **kwargs):
     return utils_remove_url_protocol(url)
 
 
+################################################################################
+# SCREENSHOT
+
+# screenshots of the flat legacy layout have no derivatives, see the
+# "build_screenshot_derivatives" command
+
+@register.filter
+def screenshot_preview_url(name):
+    if "/" in name:
+        name = get_screenshot_preview_name(name)
+
+    return screenshot_storage.url(name)
+
+
+@register.filter
+def screenshot_thumbnail_url(name):
+    if "/" in name:
+        name = get_screenshot_thumbnail_name(name)
+
+    return screenshot_storage.url(name)
+
+
 ################################################################################
 # FORMAT PHONE NUMBER
 
@@ -37,7 +37,8 @@ urlpatterns = [
     # Toaster
     re_path(r"^toaster/$", views.ToasterView.as_view(), name="toaster"),
 
-    # Secure media folder
+    # Secure media folder, it only serves the folders of the users, the web
+    # server serves the screenshots
     # re_path(r"^media/(?P<path_str>.*)$", views.SecureMediaView.as_view()),
 ]
 
@@ -1,2 +1,5 @@
 from .base import *  # noqa
+from .bloom_filter import *  # noqa
+from .filter_options import *  # noqa
+from .image import *  # noqa
 from .selenium import *  # noqa
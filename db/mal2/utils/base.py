@@ -1,13 +1,21 @@
+import fcntl
+import hashlib
+import ipaddress
 import logging
 import operator
 import os
 import re
+import tempfile
 import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from glob import glob
+from urllib import parse
 
 import requests
 from django.conf import settings
 from django.core.mail import EmailMessage
+from django.db import connection
 from django.core.management.utils import get_random_secret_key
 from django.template import loader
 from requests.exceptions import (
@@ -53,12 +61,28 @@ def get_secret_key():
 # PERMISSIONS
 
 def has_perms(user, permissions):
+    """
+    The result is cached per permission set on the user object, which lives
+    as long as the request.
+    """
+
     if not permissions:
         return True
 
-    return all(
-        [user.has_perm(permission) for permission in permissions]
-    )
+    perms_cache = getattr(user, "_has_perms_cache", None)
+
+    if perms_cache is None:
+        perms_cache = {}
+        user._has_perms_cache = perms_cache
+
+    key = frozenset(permissions)
+
+    if key not in perms_cache:
+        perms_cache[key] = all(
+            [user.has_perm(permission) for permission in permissions]
+        )
+
+    return perms_cache[key]
 
 
 ################################################################################
@@ -95,6 +119,200 @@ def remove_url_protocol(url, *args, **kwargs):
     return re.sub(r"(/?)$", r"", url)
 
 
+################################################################################
+# URL KEY
+
+def split_url(url, *args, **kwargs):
+    """
+    Split an url with `urllib.parse.urlsplit()`. Urls without a protocol are
+    treated as "http" urls. Returns None if the url can not be parsed.
+    """
+
+    if not url:
+        return None
+
+    url = url.strip()
+
+    if not re.match(r"^[a-z][a-z0-9+.\-]*://", url, re.IGNORECASE):
+        url = "http://%s" % url
+
+    try:
+        split_result = parse.urlsplit(url)
+
+        # accessing the port raises a ValueError if it is out of range
+        split_result.port
+    except ValueError:
+        return None
+
+    return split_result
+
+
+def get_url_host(url, *args, **kwargs):
+    """
+    Return the normalized host of an url: lower case, IDNA encoded and without
+    a leading "www.", e.g. "https://www.Müller.at/shop/" -> "xn--mller-kva.at".
+    """
+
+    split_result = split_url(url)
+
+    if not split_result or not split_result.hostname:
+        return None
+
+    host = split_result.hostname.rstrip(".")
+
+    if host.startswith("www."):
+        host = host[4:]
+
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+
+    return host or None
+
+
+def get_url_key(url, *args, **kwargs):
+    """
+    Return the canonical key of an url which is used for duplicate checks.
+    The key consists of the normalized host (see `get_url_host()`) and the
+    lower case path without trailing slashes. Protocol, port, query and
+    fragment are dropped, e.g. "https://www.Müller.at/Shop/?a=1" ->
+    "xn--mller-kva.at/shop".
+    """
+
+    host = get_url_host(url)
+
+    if not host:
+        return None
+
+    path = split_url(url).path.rstrip("/").lower()
+
+    return "%s%s" % (host, path)
+
+
+################################################################################
+# REGISTRABLE DOMAIN
+
+# https://publicsuffix.org/list/public_suffix_list.dat, update from time to
+# time to know new suffixes
+PUBLIC_SUFFIX_LIST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "public_suffix_list.dat",
+)
+
+
+@lru_cache(maxsize=None)
+def get_public_suffix_rules():
+    """
+    Return the rules and the exception rules of the bundled public suffix
+    list as sets of IDNA encoded suffixes.
+    """
+
+    rules = set()
+    exception_rules = set()
+
+    with open(PUBLIC_SUFFIX_LIST_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            # a rule ends at the first whitespace
+            line = line.strip().split(" ")[0]
+
+            if not line or line.startswith("//"):
+                continue
+
+            is_exception_rule = line.startswith("!")
+
+            try:
+                rule = line.lstrip("!").encode("idna").decode("ascii")
+            except UnicodeError:
+                continue
+
+            if is_exception_rule:
+                exception_rules.add(rule)
+            else:
+                rules.add(rule)
+
+    return rules, exception_rules
+
+
+def get_registrable_domain(host, *args, **kwargs):
+    """
+    Return the registrable domain (public suffix plus one label) of a host
+    normalized with `get_url_host()`, e.g. "shop1.example.co.at" ->
+    "example.co.at". IP addresses are returned as they are, public suffixes
+    return None.
+    """
+
+    if not host:
+        return None
+
+    try:
+        ipaddress.ip_address(host)
+
+        return host
+    except ValueError:
+        pass
+
+    rules, exception_rules = get_public_suffix_rules()
+    labels = host.split(".")
+
+    # the prevailing rule is the longest matching rule, without match the
+    # default rule "*" applies
+    suffix_length = 1
+
+    for i in range(len(labels)):
+        suffix = ".".join(labels[i:])
+
+        if suffix in exception_rules:
+            suffix_length = len(labels) - i - 1
+            break
+
+        if suffix in rules or "*.%s" % ".".join(labels[i + 1:]) in rules:
+            suffix_length = len(labels) - i
+            break
+
+    if len(labels) <= suffix_length:
+        return None
+
+    return ".".join(labels[-suffix_length - 1:])
+
+
+def get_url_domain(url, *args, **kwargs):
+    """
+    Return the registrable domain of an url, e.g.
+    "https://shop1.example.top/de/" -> "example.top".
+    """
+
+    return get_registrable_domain(get_url_host(url))
+
+
+################################################################################
+# HTML HASH
+
+# parts of a page that change on every request without a visible change
+VOLATILE_HTML_PATTERNS = [
+    # comments, e.g. render times of caches
+    re.compile(r"<!--.*?-->", re.DOTALL),
+    # nonces of content security policies and subresource integrity hashes
+    re.compile(r"\s(?:nonce|integrity)=(?:\"[^\"]*\"|'[^']*')", re.IGNORECASE),
+    # values of csrf tokens, e.g. <input name="csrf_token" value="...">
+    re.compile(r"(<input[^>]*name=[\"']?[^\"'>]*(?:csrf|token)[^>]*value=)(?:\"[^\"]*\"|'[^']*')", re.IGNORECASE),
+]
+
+
+def get_html_hash(html, *args, **kwargs):
+    """
+    Return the SHA-256 of the normalized HTML of a page, which ignores
+    whitespace and parts that change on every request.
+    """
+
+    for pattern in VOLATILE_HTML_PATTERNS:
+        html = pattern.sub(lambda match: match.group(1) if match.lastindex else "", html)
+
+    html = re.sub(r"\s+", " ", html).strip()
+
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
 ################################################################################
 # REGEX
 
@@ -133,6 +351,85 @@ def get_media_files(request, app_name, accept=None):
     return files
 
 
+################################################################################
+# FILES
+
+def write_file_atomic(path, data):
+    """
+    Write the bytes or an iterable of byte chunks to a temporary file next to
+    `path` and rename it afterwards, so readers never see a partially written
+    file.
+    """
+
+    directory = os.path.dirname(path)
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory,
+        prefix=".%s." % os.path.basename(path),
+    )
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, bytes):
+                data = [data]
+
+            for chunk in data:
+                f.write(chunk)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        # mkstemp() creates files only readable by the owner
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock across processes, held as long as the context is active.
+    The lock file is created next to `path`.
+    """
+
+    directory = os.path.dirname(path)
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open("%s.lock" % path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+################################################################################
+# DATABASE
+
+def transaction_lock(name):
+    """
+    Exclusive lock across processes, held until the current transaction ends.
+    Only PostgreSQL needs the lock, other databases like SQLite run one
+    writing transaction at a time anyway.
+    """
+
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [name])
+
+
 ################################################################################
 # USER
 
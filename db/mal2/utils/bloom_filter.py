@@ -0,0 +1,103 @@
+import hashlib
+import math
+import struct
+
+
+################################################################################
+# BLOOM FILTER
+
+class BloomFilter(object):
+    """
+    Bloom filter with a simple binary format, so clients can check items
+    without asking the server.
+
+    File format (all numbers big endian):
+        7 bytes  magic "MAL2BLM"
+        1 byte   format version (1)
+        1 byte   number of hash functions k
+        8 bytes  number of bits m
+        8 bytes  number of added items
+        m / 8    bytes bit array, bit i is `bits[i // 8] >> (i % 8) & 1`
+
+    The bit positions of an item are `(h1 + i * h2) % m` for i in 0..k-1,
+    where h1 and h2 are the first and second 8 bytes of the SHA-256 of the
+    UTF-8 encoded item as unsigned big endian integers, h2 with the lowest
+    bit set.
+    """
+
+    MAGIC = b"MAL2BLM"
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct(">7sBBQQ")
+
+    def __init__(self, bit_count, hash_count, item_count=0, bits=None):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.item_count = item_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+
+    @classmethod
+    def create(cls, capacity, error_rate):
+        """
+        Create an empty filter that holds `capacity` items with the given
+        false positive rate.
+        """
+
+        capacity = max(capacity, 1)
+
+        bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+
+        return cls(bit_count, hash_count)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, format_version, hash_count, bit_count, item_count = cls.HEADER.unpack_from(data)
+
+        if magic != cls.MAGIC or format_version != cls.FORMAT_VERSION:
+            raise ValueError("Unknown bloom filter format")
+
+        return cls(
+            bit_count,
+            hash_count,
+            item_count=item_count,
+            bits=bytearray(data[cls.HEADER.size:]),
+        )
+
+    def to_bytes(self):
+        header = self.HEADER.pack(
+            self.MAGIC,
+            self.FORMAT_VERSION,
+            self.hash_count,
+            self.bit_count,
+            self.item_count,
+        )
+
+        return header + bytes(self.bits)
+
+    @property
+    def capacity(self):
+        """
+        Number of items the filter holds with its false positive rate.
+        """
+
+        return int(self.bit_count * math.log(2) / self.hash_count)
+
+    def get_positions(self, item):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self.get_positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+        self.item_count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position // 8] >> (position % 8) & 1
+            for position in self.get_positions(item)
+        )
@@ -0,0 +1,84 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+
+################################################################################
+# FILTER OPTIONS
+
+def get_filter_options_version(model):
+    """
+    Return the version of the cached options of a model. A new version makes
+    all cached options of the model unreachable in every worker.
+    """
+
+    version_key = "filter_options_version:%s" % model._meta.label_lower
+    version = cache.get(version_key)
+
+    # an evicted version gets a new random one, old entries are never reused
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(version_key, version, None)
+        version = cache.get(version_key, version)
+
+    return version
+
+
+def invalidate_filter_options(model):
+    cache.set(
+        "filter_options_version:%s" % model._meta.label_lower,
+        uuid.uuid4().hex,
+        None,
+    )
+
+
+class FilterOptions(object):
+    """
+    Lazy `(value, label)` options of a select filter of a data table. The
+    options are only fetched when a template renders them and are cached
+    per language until `invalidate_filter_options()` is called for the
+    model, see "mal2_db.signals".
+    """
+
+    def __init__(self, model, value_field_name, label_field_name):
+        self.model = model
+        self.value_field_name = value_field_name
+        self.label_field_name = label_field_name
+        self._options = None
+
+    def get_options(self):
+        if self._options is not None:
+            return self._options
+
+        # translated labels differ per language
+        key = "filter_options:%s:%s:%s:%s:%s" % (
+            self.model._meta.label_lower,
+            self.value_field_name,
+            self.label_field_name,
+            get_language(),
+            get_filter_options_version(self.model),
+        )
+
+        options = cache.get(key)
+
+        if options is None:
+            options = list(
+                self.model.objects.all().values_list(
+                    self.value_field_name,
+                    self.label_field_name,
+                )
+            )
+
+            cache.set(key, options, settings.FILTER_OPTIONS_CACHE_TIMEOUT)
+
+        self._options = options
+
+        return options
+
+    def __iter__(self):
+        return iter(self.get_options())
+
+    def __len__(self):
+        return len(self.get_options())
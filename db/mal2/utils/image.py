@@ -0,0 +1,183 @@
+import hashlib
+import io
+import itertools
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import (
+    FileSystemStorage,
+    get_storage_class,
+)
+from django.utils.functional import LazyObject
+from PIL import Image
+
+from mal2.utils import write_file_atomic
+
+
+################################################################################
+# SCREENSHOT STORAGE
+
+class ScreenshotFileSystemStorage(FileSystemStorage):
+    """
+    Local storage of the screenshots. Files are replaced atomically instead of
+    being saved with an alternative name, which fits content addressed names.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        write_file_atomic(self.path(name), content.chunks())
+
+        return name
+
+
+class ScreenshotStorage(LazyObject):
+    def _setup(self):
+        storage_class = get_storage_class(settings.SCREENSHOT_STORAGE)
+        self._wrapped = storage_class(**settings.SCREENSHOT_STORAGE_OPTIONS)
+
+
+screenshot_storage = ScreenshotStorage()
+
+
+################################################################################
+# SCREENSHOT FILES
+
+def get_screenshot_name(png):
+    """
+    Return the content addressed name of a screenshot, e.g.
+    "9f/86/9f86d08...png". The screenshots are spread over two directory
+    levels by the SHA-256 of the PNG, so no directory holds more than a few
+    files and equal screenshots are stored once.
+    """
+
+    digest = hashlib.sha256(png).hexdigest()
+
+    return "%s/%s/%s.png" % (digest[:2], digest[2:4], digest)
+
+
+def get_screenshot_thumbnail_name(name):
+    return "%s.thumb.webp" % os.path.splitext(name)[0]
+
+
+def get_screenshot_preview_name(name):
+    return "%s.webp" % os.path.splitext(name)[0]
+
+
+def get_screenshot_names(name):
+    """
+    Return the names of the screenshot and all its derivatives.
+    """
+
+    return [
+        name,
+        get_screenshot_preview_name(name),
+        get_screenshot_thumbnail_name(name),
+    ]
+
+
+def encode_webp(image, quality):
+    data = io.BytesIO()
+    image.save(data, "WEBP", quality=quality, method=6)
+
+    return data.getvalue()
+
+
+def save_screenshot(png):
+    """
+    Store the PNG screenshot and its WebP derivatives: a preview in full size
+    and a thumbnail for lists. Returns the name and the perceptual hash of
+    the screenshot.
+    """
+
+    name = get_screenshot_name(png)
+
+    image = Image.open(io.BytesIO(png))
+    image.load()
+
+    # the preview and the thumbnail are saved first, so a stored screenshot
+    # always has its derivatives
+    if not screenshot_storage.exists(name):
+        thumbnail = image.convert("RGB")
+        thumbnail.thumbnail(settings.SCREENSHOT_THUMBNAIL_SIZE, Image.LANCZOS)
+
+        screenshot_storage.save(
+            get_screenshot_preview_name(name),
+            ContentFile(encode_webp(image, settings.SCREENSHOT_PREVIEW_QUALITY)),
+        )
+
+        screenshot_storage.save(
+            get_screenshot_thumbnail_name(name),
+            ContentFile(encode_webp(thumbnail, settings.SCREENSHOT_THUMBNAIL_QUALITY)),
+        )
+
+        screenshot_storage.save(name, ContentFile(png))
+
+    return name, get_image_hash(image)
+
+
+def remove_screenshot(name):
+    for screenshot_name in get_screenshot_names(name):
+        screenshot_storage.delete(screenshot_name)
+
+
+################################################################################
+# PERCEPTUAL HASH
+
+# the 64 bit hash is split into chunks of 16 bits for multi-index hashing
+IMAGE_HASH_CHUNK_COUNT = 4
+IMAGE_HASH_CHUNK_BITS = 16
+
+
+def get_image_hash(image):
+    """
+    Return the difference hash (dHash) of an image as 16 hex digits. Similar
+    images have hashes with a small Hamming distance, even if they were
+    scaled or compressed.
+    """
+
+    image = image.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(image.getdata())
+
+    value = 0
+
+    for row in range(8):
+        for column in range(8):
+            i = row * 9 + column
+            value = value << 1 | (pixels[i] > pixels[i + 1])
+
+    return "%016x" % value
+
+
+def get_image_hash_distance(hash1, hash2):
+    return bin(int(hash1, 16) ^ int(hash2, 16)).count("1")
+
+
+def get_image_hash_chunks(image_hash):
+    digits = IMAGE_HASH_CHUNK_BITS // 4
+
+    return [
+        int(image_hash[i * digits:(i + 1) * digits], 16)
+        for i in range(IMAGE_HASH_CHUNK_COUNT)
+    ]
+
+
+def get_image_hash_chunk_neighbors(chunk, max_distance):
+    """
+    Return all chunks within the Hamming distance of `chunk`.
+    """
+
+    neighbors = []
+
+    for distance in range(max_distance + 1):
+        for bits in itertools.combinations(range(IMAGE_HASH_CHUNK_BITS), distance):
+            neighbor = chunk
+
+            for bit in bits:
+                neighbor ^= 1 << bit
+
+            neighbors.append(neighbor)
+
+    return neighbors
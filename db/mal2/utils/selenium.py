@@ -1,11 +1,17 @@
 import logging
-import os
+import threading
 import time
+from contextlib import contextmanager
 
 from django.conf import settings
+from django.utils import timezone
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 
-from mal2.utils import get_response
+from mal2.utils import (
+    save_screenshot,
+    screenshot_storage,
+)
 
 
 ################################################################################
@@ -15,50 +21,234 @@ logger = logging.getLogger(__name__)
 
 
 ################################################################################
-# TAKE SCREENSHOT
+# BROWSER POOL
 
-def take_screenshot(website):
-    if not os.path.exists(settings.SCREENSHOTS_PATH):
-        os.makedirs(settings.SCREENSHOTS_PATH)
+def create_chrome_driver():
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument("headless")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--hide-scrollbars")
+    chrome_options.add_argument("--window-size=1920,1080")
+    # required if run as root user
+    chrome_options.add_argument("--no-sandbox")
 
-    name = "%s.png" % website.id
-    screenshot = os.path.join(settings.SCREENSHOTS_PATH, name)
+    driver = webdriver.Chrome(options=chrome_options)
 
-    if not os.path.exists(screenshot):
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument("headless")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--hide-scrollbars")
-        chrome_options.add_argument("--window-size=1920,1080")
-        # required if run as root user
-        chrome_options.add_argument("--no-sandbox")
+    driver.set_page_load_timeout(settings.SCREENSHOT_PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(settings.SCREENSHOT_PAGE_LOAD_TIMEOUT)
 
-        response = get_response(website.url, method="get", headers={
-            "User-Agent": "Mozilla/20.0.1 (compatible; MSIE 5.5; Windows NT)"
-        })
+    return driver
 
-        if not response:
-            return False
 
-        try:
-            driver = webdriver.Chrome(options=chrome_options)
+class BrowserSession(object):
+    def __init__(self):
+        self.driver = create_chrome_driver()
+        self.page_count = 0
 
-            driver.set_page_load_timeout(30)
-            driver.get(website.url)
+    def reset(self):
+        """
+        Close additional windows and remove cookies and storage of the
+        previous page.
+        """
+
+        driver = self.driver
 
-            time.sleep(2)
+        for handle in driver.window_handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
 
-            driver.save_screenshot(screenshot)
+        driver.switch_to.window(driver.window_handles[0])
 
-            website.screenshot = name
-            website.save()
-        except Exception as error:  # noqa
-            logger.debug(response)
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # pages without storage access, e.g. error pages
+            pass
+
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as error:
             logger.error(error)
-        finally:
+
+
+class BrowserPool(object):
+    """
+    Keeps up to `size` headless Chrome sessions warm for screenshots. A
+    session is replaced after `max_pages` pages or if it fails, so memory
+    leaks and crashed browsers do not pile up.
+    """
+
+    def __init__(self, size=None, max_pages=None):
+        self.size = size or settings.SCREENSHOT_BROWSER_POOL_SIZE
+        self.max_pages = max_pages or settings.SCREENSHOT_BROWSER_MAX_PAGES
+
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.size)
+        self._sessions = []
+
+    @contextmanager
+    def driver(self):
+        """
+        Yield the driver of an idle session, blocks while all sessions are in
+        use.
+        """
+
+        with self._semaphore:
+            with self._lock:
+                session = self._sessions.pop() if self._sessions else None
+
+            if session is None:
+                session = BrowserSession()
+
             try:
-                driver.quit()
-            except UnboundLocalError as error:
-                logger.error(error)
+                yield session.driver
+            except TimeoutException:
+                # a page that did not load in time does not break the browser
+                self._release(session)
+                raise
+            except BaseException:
+                session.quit()
+                raise
+
+            self._release(session)
+
+    def _release(self, session):
+        session.page_count += 1
+
+        if session.page_count >= self.max_pages:
+            session.quit()
+            return
+
+        try:
+            session.reset()
+        except Exception as error:
+            logger.warning("Resetting the browser failed: %s" % error)
+            session.quit()
+            return
+
+        with self._lock:
+            self._sessions.append(session)
+
+    def close(self):
+        """
+        Quit all idle sessions.
+        """
+
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = []
+
+        for session in sessions:
+            session.quit()
+
+
+################################################################################
+# PAGE READINESS
+
+# ready state, number of loaded resources and navigation result of the page,
+# "responseStatus" is 0 for browsers that do not report it
+PAGE_STATE_SCRIPT = """
+var navigation = performance.getEntriesByType("navigation")[0];
+
+return [
+    document.readyState,
+    performance.getEntriesByType("resource").length,
+    document.URL,
+    navigation && navigation.responseStatus || 0,
+];
+"""
 
+
+def wait_for_page(driver):
+    """
+    Wait until the page is ready as configured by `SCREENSHOT_WAIT_FOR`, at
+    most `SCREENSHOT_MAX_WAIT` seconds. Returns the url and the HTTP status
+    of the navigation.
+    """
+
+    wait_for = settings.SCREENSHOT_WAIT_FOR
+    deadline = time.monotonic() + settings.SCREENSHOT_MAX_WAIT
+
+    resource_count = None
+    idle_since = time.monotonic()
+
+    while True:
+        ready_state, current_resource_count, url, status = driver.execute_script(PAGE_STATE_SCRIPT)
+        now = time.monotonic()
+
+        if current_resource_count != resource_count:
+            resource_count = current_resource_count
+            idle_since = now
+
+        if ready_state == "complete":
+            if wait_for == "document_ready":
+                break
+
+            if wait_for == "network_idle" and now - idle_since >= settings.SCREENSHOT_NETWORK_IDLE_TIME:
+                break
+
+        if now >= deadline:
+            break
+
+        time.sleep(0.1)
+
+    return url, status
+
+
+def is_page_loaded(url, status):
+    # chrome shows its own error page if the site is not reachable
+    if url.startswith("chrome-error://"):
+        return False
+
+    return not status or status < 400
+
+
+################################################################################
+# TAKE SCREENSHOT
+
+def take_screenshot(website, browser_pool=None, overwrite=False):
+    """
+    Take a screenshot of the website if there is none yet or `overwrite` is
+    True. Returns False if the website could not be loaded. Without
+    `browser_pool` a browser is started only for this screenshot.
+    """
+
+    if not overwrite and website.screenshot and screenshot_storage.exists(website.screenshot):
         return True
+
+    pool = browser_pool or BrowserPool(size=1)
+    success = False
+
+    try:
+        with pool.driver() as driver:
+            driver.get(website.url)
+
+            url, status = wait_for_page(driver)
+
+            if not is_page_loaded(url, status):
+                logger.debug("%s could not be loaded (%s %s)" % (website.url, url, status))
+
+                return False
+
+            png = driver.get_screenshot_as_png()
+
+        name, screenshot_hash = save_screenshot(png)
+
+        # the website may have been edited while the page was loading
+        website.screenshot = name
+        website.screenshot_at = timezone.now()
+        website.screenshot_hash = screenshot_hash
+        website.save(update_fields=["screenshot", "screenshot_at", "screenshot_hash", "modified_at"])
+
+        success = True
+    except Exception as error:  # noqa
+        logger.error(error)
+    finally:
+        if browser_pool is None:
+            pool.close()
+
+    return success
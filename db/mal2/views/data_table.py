@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import OrderedDict
 
 from django.core.exceptions import (
     FieldDoesNotExist,
@@ -24,9 +25,17 @@ from django.db.models.functions import (
     Cast,
     Concat,
 )
+from django.db.models.query_utils import DeferredAttribute
 from django.http import JsonResponse
-from django.template.loader import render_to_string
-from django.urls import reverse
+from django.template import Context
+from django.template.loader import (
+    get_template,
+    render_to_string,
+)
+from django.urls import (
+    NoReverseMatch,
+    reverse,
+)
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 from django.views.generic.base import (
@@ -47,10 +56,102 @@ from mal2.utils import (
 logger = logging.getLogger(__name__)
 
 
+################################################################################
+# URL FORMAT
+
+# id that is reversed in place of the real one, it matches "\d+" and is
+# unlikely to be part of the url otherwise
+URL_ID_PLACEHOLDER = 9081726354
+
+
+def get_url_format(viewname, url_kwarg):
+    """
+    Return a format string of the url with "%s" in place of the id or None
+    if the url can not be reversed with a numeric id.
+    """
+
+    try:
+        url = reverse(viewname, kwargs={
+            url_kwarg: URL_ID_PLACEHOLDER,
+        })
+    except NoReverseMatch:
+        return None
+
+    placeholder = str(URL_ID_PLACEHOLDER)
+
+    if url.count(placeholder) != 1:
+        return None
+
+    return url.replace("%", "%%").replace(placeholder, "%s")
+
+
+################################################################################
+# CELL RENDERER
+
+class CellRenderer(object):
+    """
+    Renders a cell template of a data table for rows of field values. The
+    template is compiled once and all cells of a page share one context, so
+    the result is the same as with `render_to_string()` per cell.
+    """
+
+    def __init__(self, template_name, field_names):
+        self.template = get_template(template_name).template
+        self.field_names = field_names
+
+    def get_context(self, request):
+        engine = self.template.engine
+        context = Context(autoescape=engine.autoescape)
+
+        # same as `RequestContext.bind_template()`, but only once
+        updates = {}
+
+        for processor in engine.template_context_processors:
+            updates.update(processor(request))
+
+        context.update(updates)
+
+        return context
+
+    def render(self, context, row, extra_context):
+        cell_context = dict(extra_context)
+        cell_context.update(zip(self.field_names, row))
+
+        with context.push(cell_context):
+            return self.template.render(context)
+
+
+################################################################################
+# DATA TABLE ROW
+
+class DataTableRow(object):
+    """
+    Row of a data table fetched with `values_list()` instead of a model
+    instance. The values are looked up by their field name, e.g.
+    "risk_score__name", the column indexes are shared by all rows.
+    """
+
+    __slots__ = (
+        "column_indexes",
+        "values",
+    )
+
+    def __init__(self, column_indexes, values):
+        self.column_indexes = column_indexes
+        self.values = values
+
+    def __getitem__(self, field_name):
+        return self.values[self.column_indexes[field_name]]
+
+
 ################################################################################
 # DATA TABLE MIXIN
 
 class DataTableMixin(object):
+    # render the cell templates with a compiled renderer, otherwise with
+    # `render_to_string()` per cell, e.g. to compare both
+    compile_cell_templates = True
+
     def init_permissions(self, request, data_table):
         user = request.user
 
@@ -185,53 +286,148 @@ class DataTableMixin(object):
 
         return column
 
-    def get_field_template(self, request, field_name, field_value, item):
+    @classmethod
+    def get_cell_renderer(cls, template_name, field_names):
+        """
+        Return the renderer of a cell template, it is compiled once per view
+        class.
+        """
+
+        # not inherited, subclasses have their own renderers
+        cell_renderers = cls.__dict__.get("_cell_renderers")
+
+        if cell_renderers is None:
+            cell_renderers = {}
+            cls._cell_renderers = cell_renderers
+
+        key = (template_name, field_names)
+        cell_renderer = cell_renderers.get(key)
+
+        if cell_renderer is None:
+            cell_renderer = CellRenderer(template_name, field_names)
+            cell_renderers[key] = cell_renderer
+
+        return cell_renderer
+
+    def render_cell(self, request, template_name, row, extra_context):
+        if not self.compile_cell_templates:
+            context = dict(extra_context)
+            context.update(zip(self.data_table["field_names"], row))
+
+            return render_to_string(template_name, context, request=request)
+
+        cell_renderer = self.get_cell_renderer(
+            template_name,
+            tuple(self.data_table["field_names"]),
+        )
+
+        # the view is instantiated per request, the context processors run
+        # once for all cells of the page
+        if getattr(self, "cell_context", None) is None:
+            self.cell_context = cell_renderer.get_context(request)
+
+        return cell_renderer.render(self.cell_context, row, extra_context)
+
+    def get_row(self, item):
+        """
+        Return the values of all fields of an item as a tuple in the order
+        of "field_names".
+        """
+
+        if isinstance(item, (dict, DataTableRow)):
+            # if item is a dict (DataTableListView) or a projected row
+            return tuple(
+                item[field_name] for field_name in self.data_table["field_names"]
+            )
+
+        # if item is a model (DataTableView)
+        return tuple(
+            self._get_field_name(item, field_name) for field_name in self.data_table["field_names"]
+        )
+
+    def get_field_template(self, request, field_name, field_value, row):
         field_templates = self.data_table.get("field_templates", {})
         field_template = field_templates.get(field_name)
 
         if not field_template:
             return field_value
 
-        context = {
+        return self.render_cell(request, field_template, row, {
             "field_value": field_value,
-        }
+        })
 
-        for field_name in self.data_table["field_names"]:
-            if isinstance(item, dict):
-                context[field_name] = item[field_name]
-            else:
-                context[field_name] = self._get_field_name(item, field_name)
+    def get_item_actions(self):
+        """
+        Merge the url items with their defaults and reverse their urls once
+        per request, so an action of a row only needs a string format.
+        """
 
-        return render_to_string(
-            field_template,
-            context,
-            request=request,
-        )
+        item_actions = getattr(self, "item_actions", None)
+
+        if item_actions is not None:
+            return item_actions
 
-    def add_item_actions(self, request, item_values, item):
         urls = self.data_table.get("urls")
         url_items = urls.get("item", [])
         url_defaults = urls.get("defaults", {})
 
+        item_actions = []
+
         for url_item in url_items:
             url_item = {**url_defaults, **url_item}
-            context = url_item.get("context", {})
-            href = url_item.get("href", None)
+            url_id = url_item.get("id", "pk")
 
+            context = dict(url_item.get("context", {}))
             context["attrs"] = url_item.get("attrs", {})
 
-            if href:
-                url_id = url_item.get("id", "pk")
+            item_actions.append({
+                "context": context,
+                "field_name": url_item["field_name"],
+                "href": url_item.get("href", None),
+                "href_formats": {},
+                "template": url_item["template"],
+                "url_id": url_id,
+                "url_ids": url_id.split("__"),
+            })
+
+        self.item_actions = item_actions
+
+        return item_actions
+
+    def get_href(self, item_action, url_kwarg, item_id):
+        href_formats = item_action["href_formats"]
+
+        if url_kwarg not in href_formats:
+            href_formats[url_kwarg] = get_url_format(item_action["href"], url_kwarg)
+
+        href_format = href_formats[url_kwarg]
+
+        if href_format is None or not isinstance(item_id, int):
+            return reverse(item_action["href"], kwargs={
+                url_kwarg: item_id,
+            })
+
+        return href_format % item_id
+
+    def add_item_actions(self, request, item_values, item, row):
+        for item_action in self.get_item_actions():
+            context = item_action["context"]
+
+            if item_action["href"]:
+                url_id = item_action["url_id"]
 
                 if isinstance(item, dict):
                     # if item is a dict (DataTableListView)
                     item_id = item.get(url_id, item.get("id"))
+                elif isinstance(item, DataTableRow):
+                    # if item is a projected row (DataTableView)
+                    item_id = item[url_id] or item["pk"]
+                    url_id = item_action["url_ids"][-1]
                 else:
                     # if item is a model (DataTableView)
-                    url_ids = url_id.split("__")
                     last_item_id = None
 
-                    for url_id in url_ids:
+                    for url_id in item_action["url_ids"]:
                         if last_item_id:
                             last_item_id = getattr(last_item_id, url_id)
                         else:
@@ -239,23 +435,17 @@ class DataTableMixin(object):
 
                     item_id = last_item_id or getattr(item, "pk")
 
-                context["href"] = reverse(href, kwargs={
-                    url_id: item_id,
-                })
-
-            # append data of all fields to the url item context
-            for field_name in self.data_table["field_names"]:
-                if isinstance(item, dict):
-                    # if item is a dict (DataTableListView)
-                    context[field_name] = item[field_name]
-                else:
-                    # if item is a model (DataTableView)
-                    context[field_name] = self._get_field_name(item, field_name)
+                context = {
+                    **context,
+                    "href": self.get_href(item_action, url_id, item_id),
+                }
 
-            item_values[url_item["field_name"]] = render_to_string(
-                url_item["template"],
+            # the data of all fields is appended by the renderer
+            item_values[item_action["field_name"]] = self.render_cell(
+                request,
+                item_action["template"],
+                row,
                 context,
-                request=request,
             )
 
         return item_values
@@ -402,6 +592,9 @@ class DataTableModelMixin(DataTableMixin):
                 return field.__class__
 
     def get_field_value(self, field_name, instance):
+        if isinstance(instance, DataTableRow):
+            return instance[field_name]
+
         relation_field_names = field_name.split("__")
         num_field_relations = len(relation_field_names)
 
@@ -416,6 +609,18 @@ class DataTableModelMixin(DataTableMixin):
                 # f.e. uba_sectors__code means when uba_sectors is m2m then code
                 # is our next outputfield
 
+                # the prefetched objects of `add_selected_relations()` are
+                # used if the output field is a field of the related model
+                related_objects = current_value.all()
+                output_field = self.get_prefetched_output_field(
+                    related_objects, relation_field_names, relation_index,
+                )
+
+                if output_field is not None:
+                    return ', '.join(
+                        [str(getattr(i, output_field.attname)) for i in related_objects]
+                    )
+
                 return ', '.join(
                     [str(i) for i in current_value.all().values_list(
                         relation_field_names[num_field_relations - 1], flat=True
@@ -430,6 +635,24 @@ class DataTableModelMixin(DataTableMixin):
 
                 return current_value
 
+    def get_prefetched_output_field(self, related_objects, relation_field_names, relation_index):
+        # a prefetched relation returns its already evaluated queryset
+        if related_objects._result_cache is None:
+            return None
+
+        if relation_index != len(relation_field_names) - 2:
+            return None
+
+        try:
+            output_field = related_objects.model._meta.get_field(relation_field_names[-1])
+        except FieldDoesNotExist:
+            return None
+
+        if not output_field.concrete or output_field.many_to_many:
+            return None
+
+        return output_field
+
     def is_field_a_string_or_text_field(self, field_relation_string, model):
         if ANNOTATION_FIELD_SUFFIX in field_relation_string:
             return True
@@ -449,13 +672,50 @@ class DataTableModelMixin(DataTableMixin):
 
         return False
 
+    def get_related_lookups(self):
+        """
+        Derive the relations of "field_names" and "field_outputs": single
+        valued relations are joined, multi valued relations are prefetched
+        with one query per page.
+        """
+
+        select_related = set(self.data_table.get("select_relations", None) or [])
+        prefetch_related = set()
+
+        field_names = list(self.data_table["field_names"]) + list(self.field_outputs.values())
+
+        for field_name in field_names:
+            model = self.model
+            lookup = []
+
+            for relation_field_name in field_name.split("__"):
+                try:
+                    field = model._meta.get_field(relation_field_name)
+                except FieldDoesNotExist:
+                    break
+
+                if not field.is_relation or field.related_model is None:
+                    break
+
+                lookup.append(relation_field_name)
+
+                if field.many_to_many or field.one_to_many:
+                    prefetch_related.add("__".join(lookup))
+                    break
+
+                select_related.add("__".join(lookup))
+                model = field.related_model
+
+        return sorted(select_related), sorted(prefetch_related)
+
     def add_selected_relations(self, queryset):
-        select_relations = self.data_table.get("select_relations", None)
+        select_related, prefetch_related = self.get_related_lookups()
 
-        if select_relations:
-            queryset = self.model.objects.all().select_related(
-                *select_relations
-            )
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
 
         return queryset
 
@@ -547,6 +807,142 @@ class DataTableModelMixin(DataTableMixin):
 
         return queryset
 
+    def get_page_field_names(self):
+        """
+        Return the names of all fields a page of the data table shows or
+        needs for its actions.
+        """
+
+        field_names = ["pk"]
+        field_names.extend(self.data_table["field_names"])
+        field_names.extend(self.field_outputs.values())
+
+        row_id = self.data_table.get("row_id", None)
+
+        if row_id:
+            field_names.append(row_id)
+
+        for item_action in self.get_item_actions():
+            if item_action["href"]:
+                field_names.append(item_action["url_id"])
+
+        # without duplicates, in order
+        return list(OrderedDict.fromkeys(field_names))
+
+    def is_forward_relation(self, relation):
+        model = self.model
+
+        for relation_field_name in relation.split("__"):
+            try:
+                field = model._meta.get_field(relation_field_name)
+            except FieldDoesNotExist:
+                return False
+
+            if not field.concrete or not (field.many_to_one or field.one_to_one):
+                return False
+
+            model = field.related_model
+
+        return True
+
+    def is_projected_field(self, queryset, field_name):
+        """
+        A field can be projected if `values_list()` returns the same value
+        as the attributes of the model instance: a concrete field without a
+        special descriptor, reached by forward foreign keys only.
+        """
+
+        if field_name == "pk" or field_name in queryset.query.annotations:
+            return True
+
+        relation, separator, name = field_name.rpartition("__")
+
+        if relation and not self.is_forward_relation(relation):
+            return False
+
+        model = self.model
+
+        for relation_field_name in field_name.split("__")[:-1]:
+            model = model._meta.get_field(relation_field_name).related_model
+
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+
+        if not field.concrete or field.is_relation:
+            return False
+
+        # other descriptors change the value, e.g. translated fields return
+        # the value of the active language
+        descriptor = getattr(model, field.attname, None)
+
+        return type(descriptor) is DeferredAttribute or not hasattr(type(descriptor), "__get__")
+
+    def get_only_field_names(self, queryset, field_names):
+        """
+        Return the field names for `only()` if the fields can not be
+        projected: the models of the other fields are loaded completely.
+        Returns None if the root model has to be loaded completely.
+        """
+
+        only_field_names = []
+        loaded_relations = []
+
+        for field_name in field_names:
+            if field_name in queryset.query.annotations:
+                continue
+
+            if self.is_projected_field(queryset, field_name):
+                only_field_names.append(field_name)
+                continue
+
+            relation = field_name.rpartition("__")[0]
+
+            if not relation or not self.is_forward_relation(relation):
+                return None
+
+            loaded_relations.append(relation)
+
+        # a field of a completely loaded model would defer its other fields
+        only_field_names = [
+            field_name for field_name in only_field_names
+            if not any(
+                field_name.startswith(relation + "__") for relation in loaded_relations
+            )
+        ]
+
+        return only_field_names + loaded_relations
+
+    def get_projected_rows(self, queryset):
+        """
+        Fetch only the columns a page needs: as `DataTableRow` tuples if all
+        fields can be projected, as model instances with deferred fields
+        otherwise.
+        """
+
+        field_names = self.get_page_field_names()
+
+        if queryset._prefetch_related_lookups:
+            return queryset
+
+        if all(self.is_projected_field(queryset, field_name) for field_name in field_names):
+            column_indexes = {
+                field_name: index for index, field_name in enumerate(field_names)
+            }
+
+            return [
+                DataTableRow(column_indexes, values)
+                for values in queryset.values_list(*field_names)
+            ]
+
+        only_field_names = self.get_only_field_names(queryset, field_names)
+
+        if only_field_names is None:
+            return queryset
+
+        return queryset.only(*only_field_names)
+
     def get_search_type(self, field_name):
         field_filter = self.field_filters.get(field_name)
 
@@ -726,14 +1122,23 @@ class DataTableModelMixin(DataTableMixin):
             start = int(data.get("start", 0))
             queryset = queryset[start:start + entries_per_page]
 
+        # only the columns of the page are fetched if possible
+        items = self.get_projected_rows(queryset)
+
         data_list = []
 
-        for index, item in enumerate(queryset):
+        for index, item in enumerate(items):
             row_id = self.data_table.get("row_id", None)
+            row = self.get_row(item)
+
+            if isinstance(item, DataTableRow):
+                row_id_value = row_id and item[row_id]
+            else:
+                row_id_value = row_id and getattr(item, row_id)
 
             item_values = {
                 "DT_RowId": "row-%s" % (
-                    row_id and getattr(item, row_id) or index + 1
+                    row_id_value or index + 1
                 ),
                 "add": "",
             }
@@ -755,11 +1160,11 @@ class DataTableModelMixin(DataTableMixin):
 
                 item_values.update({
                     field_name: self.get_field_template(
-                        request, field_name, field_value, item,
+                        request, field_name, field_value, row,
                     )
                 })
 
-            item_values = self.add_item_actions(request, item_values, item)
+            item_values = self.add_item_actions(request, item_values, item, row)
 
             data_list.append(item_values)
 
@@ -867,6 +1272,7 @@ class DataTableListMixin(DataTableMixin):
 
         for index, item in enumerate(items):
             row_id = self.data_table.get("row_id", None)
+            row = self.get_row(item)
 
             item_values = {
                 "DT_RowId": "row-%s" % (
@@ -882,11 +1288,11 @@ class DataTableListMixin(DataTableMixin):
 
                     item_values.update({
                         field_name: self.get_field_template(
-                            request, field_name, field_value, item,
+                            request, field_name, field_value, row,
                         )
                     })
 
-            item_values = self.add_item_actions(request, item_values, item)
+            item_values = self.add_item_actions(request, item_values, item, row)
 
             data_list.append(item_values)
 
@@ -84,6 +84,11 @@ class AjaxFormView(ToasterMixin, FormView):
 
         self.object = form.save(**kwargs)
 
+        # the form is able to reject the data while saving, e.g. if a database
+        # constraint is violated by a concurrent request
+        if form.errors:
+            return self.form_invalid(form)
+
         formset_data = self.get_formsets_data(
             data=self.request.POST,
             instance=self.object
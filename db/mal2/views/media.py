@@ -2,6 +2,8 @@ import base64
 import logging
 import mimetypes
 import os
+import re
+from functools import lru_cache
 from urllib import parse
 
 import magic
@@ -10,12 +12,15 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured
 from django.core.files.storage import FileSystemStorage
 from django.http import (
+    FileResponse,
     Http404,
     HttpResponse,
     HttpResponseForbidden,
     JsonResponse,
 )
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.base import (
     TemplateView,
@@ -91,9 +96,55 @@ class UploadMixin(object):
 
 
 ################################################################################
-# SECURE MEDIA VIEW
+# SEND FILE MIXIN
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class FileRange(object):
+    """
+    File-like object that reads `length` bytes of a file from `start` on.
+    """
+
+    def __init__(self, f, start, length):
+        self.f = f
+        self.f.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.f.read(size)
+        self.remaining -= len(data)
+
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+@lru_cache(maxsize=1024)
+def get_content_type(path, inode, mtime_ns):
+    """
+    Detect the content type of a file. The result is cached until the file
+    is replaced, which changes the inode or the modification time.
+    """
+
+    return magic.from_file(path, mime=True)
+
+
+class SendFileMixin(object):
+    """
+    Serve files with the "X-Sendfile" header of the web server. The
+    development server on localhost streams the file instead and handles
+    conditional and range requests itself.
+    """
 
-class SecureMediaView(LoginRequiredMixin, View):
     def is_server_localhost(self):
         server = self.request.META.get("HTTP_HOST", None)
 
@@ -102,34 +153,136 @@ class SecureMediaView(LoginRequiredMixin, View):
 
         return False
 
-    def get(self, request, *args, **kwargs):
-        path_str = kwargs.get("path_str", "")
-        path = os.path.join(settings.MEDIA_ROOT, path_str)
+    def get_range(self, stat, etag):
+        """
+        Return the (start, end) of a satisfiable single "Range" header or None
+        for the whole file. Raises `RangeNotSatisfiable` otherwise.
 
-        if not path.startswith(os.path.join(settings.MEDIA_ROOT, str(request.user.id))):
-            return HttpResponseForbidden()
+        A syntactically invalid header is ignored, see RFC 7233, section 3.1.
+        """
 
-        if not os.path.exists(path) or os.path.isdir(path):
-            raise Http404(_("File not found"))
+        match = RANGE_RE.match(self.request.META.get("HTTP_RANGE", ""))
+
+        if match is None:
+            return None
+
+        # the range applies to the version of the file the client knows only
+        if_range = self.request.META.get("HTTP_IF_RANGE")
+
+        if if_range and if_range not in (etag, http_date(stat.st_mtime)):
+            return None
+
+        first, last = match.groups()
+        size = stat.st_size
+
+        if first:
+            start = int(first)
+
+            # e.g. "bytes=5-3" is invalid, not unsatisfiable
+            if last and int(last) < start:
+                return None
+
+            end = min(int(last), size - 1) if last else size - 1
+        elif last:
+            start = max(size - int(last), 0)
+            end = size - 1
+        else:
+            return None
+
+        if start > end or start >= size:
+            raise RangeNotSatisfiable()
+
+        return start, end
+
+    def get_file_response(self, path, content_type=None, filename=None, etag=None):
+        """
+        The ETag is derived from the file unless the caller knows a better
+        one, e.g. a version. Files are replaced on every change, so the
+        modification time is a valid "Last-Modified" either way.
+        """
 
-        filename = os.path.basename(path)
+        stat = os.stat(path)
 
-        http_response = HttpResponse(
-            content_type=magic.from_file(path, mime=True)
+        # every change of the file changes the modification time or the size
+        if etag is None:
+            etag = "\"%x-%x\"" % (stat.st_mtime_ns, stat.st_size)
+
+        conditional_response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=int(stat.st_mtime),
         )
 
-        http_response["Content-Disposition"] = "inline; filename=\"%s\"" % (filename,)
-        http_response["Content-Length"] = os.path.getsize(path)
+        if conditional_response is not None:
+            if conditional_response.status_code == 304:
+                conditional_response["ETag"] = etag
+                conditional_response["Last-Modified"] = http_date(stat.st_mtime)
+
+            return conditional_response
+
+        if content_type is None:
+            content_type = get_content_type(path, stat.st_ino, stat.st_mtime_ns)
+
+        if filename is None:
+            filename = os.path.basename(path)
 
         if self.is_server_localhost():
-            with open(path, "rb") as f:
-                http_response.write(f.read())
+            try:
+                file_range = self.get_range(stat, etag)
+            except RangeNotSatisfiable:
+                http_response = HttpResponse(status=416)
+                http_response["Content-Range"] = "bytes */%s" % stat.st_size
+
+                return http_response
+
+            f = open(path, "rb")
+
+            if file_range is None:
+                http_response = FileResponse(f, content_type=content_type)
+                http_response["Content-Length"] = stat.st_size
+            else:
+                start, end = file_range
+
+                http_response = FileResponse(
+                    FileRange(f, start, end - start + 1),
+                    content_type=content_type,
+                    status=206,
+                )
+                http_response["Content-Length"] = end - start + 1
+                http_response["Content-Range"] = "bytes %s-%s/%s" % (start, end, stat.st_size)
         else:
+            # the web server handles range requests of sent files itself
+            http_response = HttpResponse(content_type=content_type)
+            http_response["Content-Length"] = stat.st_size
             http_response["X-Sendfile"] = path.encode("utf-8")
 
+        http_response["Accept-Ranges"] = "bytes"
+        http_response["Content-Disposition"] = "inline; filename=\"%s\"" % (filename,)
+        http_response["ETag"] = etag
+        http_response["Last-Modified"] = http_date(stat.st_mtime)
+
         return http_response
 
 
+################################################################################
+# SECURE MEDIA VIEW
+
+class SecureMediaView(LoginRequiredMixin, SendFileMixin, View):
+    def get(self, request, *args, **kwargs):
+        path_str = kwargs.get("path_str", "")
+        # resolved, so "../" can not leave the folder of the user
+        path = os.path.realpath(os.path.join(settings.MEDIA_ROOT, path_str))
+        user_path = os.path.realpath(os.path.join(settings.MEDIA_ROOT, str(request.user.id)))
+
+        if not path.startswith(user_path + os.sep):
+            return HttpResponseForbidden()
+
+        if not os.path.exists(path) or os.path.isdir(path):
+            raise Http404(_("File not found"))
+
+        return self.get_file_response(path)
+
+
 ################################################################################
 # FILE TREE
 
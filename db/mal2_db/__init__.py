@@ -0,0 +1 @@
+default_app_config = "mal2_db.apps.Mal2DbConfig"
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class Mal2DbConfig(AppConfig):
     name = 'mal2_db'
+
+    def ready(self):
+        from mal2_db import signals  # noqa
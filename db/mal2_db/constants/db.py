@@ -13,3 +13,36 @@ DB_UNSURE = 5
 WEBSITE_CATEGORY_UNKNOWN = 1
 WEBSITE_CATEGORY_ONLINE_SHOP = 2
 WEBSITE_CATEGORY_OTHER = 3
+
+################################################################################
+# VERDICT
+
+VERDICT_FAKE_SHOP = "fake_shop"
+VERDICT_COUNTERFEITER = "counterfeiter"
+VERDICT_UNSURE = "unsure"
+VERDICT_NO_FAKE = "no_fake"
+VERDICT_UNKNOWN = "unknown"
+
+# if several websites share a host, the first verdict in this order wins
+VERDICTS = (
+    VERDICT_FAKE_SHOP,
+    VERDICT_COUNTERFEITER,
+    VERDICT_UNSURE,
+    VERDICT_NO_FAKE,
+    VERDICT_UNKNOWN,
+)
+
+################################################################################
+# WEBSITE STATUS
+
+# website is not in the fake shop or counterfeiter database
+WEBSITE_STATUS_OPEN = "open"
+WEBSITE_STATUS_FAKE_SHOP = "fake_shop"
+WEBSITE_STATUS_COUNTERFEITER = "counterfeiter"
+
+################################################################################
+# SCREENSHOT STATUS
+
+SCREENSHOT_STATUS_PENDING = "pending"
+SCREENSHOT_STATUS_DONE = "done"
+SCREENSHOT_STATUS_FAILED = "failed"
@@ -1,5 +1,8 @@
 from django.core import exceptions
-from django.db.models import Q
+from django.db import (
+    IntegrityError,
+    transaction,
+)
 from django.forms import (
     HiddenInput,
     inlineformset_factory,
@@ -14,10 +17,7 @@ from mal2.forms import (
     FieldsetModelForm,
     ModelForm,
 )
-from mal2.utils import (
-    remove_url_protocol,
-    take_screenshot,
-)
+from mal2.utils import get_url_key
 from mal2_db.constants.db import (
     DB_COUNTERFEITE,
     DB_FAKE_SHOP,
@@ -35,6 +35,7 @@ from mal2_db.models.base import (
     mal2CounterfeitersDB,
     mal2FakeShopDB,
 )
+from mal2_db.utils import enqueue_screenshot
 
 
 ################################################################################
@@ -89,16 +90,18 @@ class WebsiteForm(FieldsetModelForm):
 
     def clean_url(self):
         url = self.cleaned_data["url"]
-        url.strip("/")
+        url_key = get_url_key(url)
 
-        url_to_check = remove_url_protocol(url)
+        # urls without a key (e.g. without host) can not be duplicates, an
+        # unchanged url may be a legacy duplicate without key
+        if not url_key or (self.instance.pk and url == self.instance.url):
+            return url
 
-        website = Website.objects.filter(
-            Q(url="http://%s" % url_to_check)
-            | Q(url="https://%s" % url_to_check)
-        ).first()
+        website_id = Website.objects.filter(
+            url_key=url_key,
+        ).values_list("id", flat=True).first()
 
-        if website and website.id != self.instance.id:
+        if website_id and website_id != self.instance.id:
             raise exceptions.ValidationError(
                 _("URL already exists in the database!"),
                 code="invalid",
@@ -118,9 +121,20 @@ class WebsiteForm(FieldsetModelForm):
             else:
                 website.website_category_id = WEBSITE_CATEGORY_UNKNOWN
 
-        website.save()
+        # the duplicate check in `clean_url()` can not prevent concurrent
+        # requests with the same url, the unique url key has the last word
+        try:
+            with transaction.atomic():
+                website.save()
+        except IntegrityError:
+            self.add_error("url", exceptions.ValidationError(
+                _("URL already exists in the database!"),
+                code="invalid",
+            ))
+
+            return None
 
-        take_screenshot(website)
+        enqueue_screenshot(website)
 
         return website
 
@@ -376,23 +390,25 @@ class DBFormMixin(object):
 
     def clean_url(self):
         url = self.cleaned_data["url"]
-        url.strip("/")
+        url_key = get_url_key(url)
 
-        url_to_check = remove_url_protocol(url)
+        # urls without a key (e.g. without host) can not be duplicates, an
+        # unchanged url may be a legacy duplicate without key
+        if not url_key or (self.instance.pk and url == self.instance.url):
+            return url
 
-        website = Website.objects.filter(
-            Q(url="http://%s" % url_to_check)
-            | Q(url="https://%s" % url_to_check)
-        ).first()
+        url_website_id = Website.objects.filter(
+            url_key=url_key,
+        ).values_list("id", flat=True).first()
 
         raise_error = False
         website_id = getattr(self, "website_id", None)
 
         if website_id:
             raise_error = False
-        elif website and not self.instance.website:
+        elif url_website_id and not self.instance.website:
             raise_error = True
-        elif website and website.id != self.instance.website.id:
+        elif url_website_id and url_website_id != self.instance.website.id:
             raise_error = True
 
         if raise_error:
@@ -406,26 +422,37 @@ class DBFormMixin(object):
     def save(self, commit=False):
         data = self.cleaned_data
 
-        instance = super().save(commit=commit)
-
-        if not self.website and not instance.website:
-            self.website = Website.objects.create(
-                url=data["url"],
-                website_type_id=self.website_type_id,
-                assigned_to_id=self.request.user.id,
-            )
-
-        if self.website:
-            instance.website = self.website
-
-        instance.save()
+        # the duplicate check in `clean_url()` can not prevent concurrent
+        # requests with the same url, the unique url key has the last word
+        try:
+            with transaction.atomic():
+                instance = super().save(commit=commit)
+
+                if not self.website and not instance.website:
+                    self.website = Website.objects.create(
+                        url=data["url"],
+                        website_type_id=self.website_type_id,
+                        assigned_to_id=self.request.user.id,
+                    )
+
+                if self.website:
+                    instance.website = self.website
+
+                instance.save()
+
+                # Update URL in website model
+                website = instance.website
+                website.url = instance.url
+                website.save()
+        except IntegrityError:
+            self.add_error("url", exceptions.ValidationError(
+                _("URL already exists in the database!"),
+                code="invalid",
+            ))
 
-        # Update URL in website model
-        website = instance.website
-        website.url = instance.url
-        website.save()
+            return None
 
-        take_screenshot(website)
+        enqueue_screenshot(website)
 
         return instance
 
@@ -0,0 +1,143 @@
+import statistics
+import time
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import (
+    NoReverseMatch,
+    resolve,
+    reverse,
+)
+
+from mal2_db.models import User
+
+
+################################################################################
+# BENCHMARK DATA TABLE
+
+class Command(BaseCommand):
+    help = "Measure the time to render a page of a data table, e.g. \"mal2_db:all_websites_data\"."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url_name",
+            nargs="?",
+            default="mal2_db:all_websites_data",
+            help="URL name of the data view of the data table.",
+        )
+
+        parser.add_argument(
+            "--user",
+            help="Username of the requesting user, the first superuser by default.",
+        )
+
+        parser.add_argument(
+            "--length",
+            default=50,
+            type=int,
+            help="Rows per page.",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            default=20,
+            type=int,
+            help="Number of measured requests, after one warm up request.",
+        )
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by("id").first()
+
+        if user is None:
+            raise CommandError("User not found.")
+
+        if options["length"] < 1:
+            raise CommandError("--length must be at least 1.")
+
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+
+        try:
+            path = reverse(options["url_name"])
+        except NoReverseMatch:
+            raise CommandError("URL name %s not found." % options["url_name"])
+
+        match = resolve(path)
+        view_class = getattr(match.func, "view_class", None)
+
+        if view_class is None or not hasattr(view_class, "compile_cell_templates"):
+            raise CommandError("%s is not a data view." % options["url_name"])
+
+        request_factory = RequestFactory()
+
+        def get_request():
+            request = request_factory.get(path, {
+                "draw": "1",
+                "length": options["length"],
+                "start": "0",
+            })
+
+            # a fresh user per request like the authentication middleware
+            # loads it, the permissions are cached on the user object
+            request.user = User.objects.get(pk=user.pk)
+
+            return request
+
+        def benchmark(compile_cell_templates):
+            view = view_class.as_view(**dict(
+                getattr(match.func, "view_initkwargs", {}),
+                compile_cell_templates=compile_cell_templates,
+            ))
+
+            # the first request compiles the templates
+            view(get_request(), *match.args, **match.kwargs)
+
+            timings = []
+            query_count = 0
+
+            for i in range(options["repeat"]):
+                request = get_request()
+
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = view(request, *match.args, **match.kwargs)
+                    timings.append(time.perf_counter() - start)
+
+                if response.status_code != 200:
+                    raise CommandError("Request failed with status %s." % response.status_code)
+
+                query_count = len(queries)
+
+            return timings, query_count
+
+        self.stdout.write(
+            "%s: %s requests with %s rows per page" % (
+                path,
+                options["repeat"],
+                options["length"],
+            )
+        )
+
+        for label, compile_cell_templates in (
+            ("render_to_string", False),
+            ("compiled", True),
+        ):
+            timings, query_count = benchmark(compile_cell_templates)
+
+            self.stdout.write(self.style.SUCCESS(
+                "%s: min %.1f ms, median %.1f ms, max %.1f ms per page, %s queries" % (
+                    label,
+                    min(timings) * 1000,
+                    statistics.median(timings) * 1000,
+                    max(timings) * 1000,
+                    query_count,
+                )
+            ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from mal2_db.utils import build_bloom_filter
+
+
+################################################################################
+# BUILD BLOOM FILTER
+
+class Command(BaseCommand):
+    help = "Build the bloom filter of the fake shop and counterfeiter hosts from scratch."
+
+    def handle(self, *args, **options):
+        bloom_filter = build_bloom_filter()
+
+        self.stdout.write(self.style.SUCCESS(
+            "Built bloom filter with %s hosts (%s bytes)." % (
+                bloom_filter.item_count,
+                len(bloom_filter.bits),
+            )
+        ))
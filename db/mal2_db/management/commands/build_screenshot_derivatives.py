@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from mal2.utils import (
+    save_screenshot,
+    screenshot_storage,
+)
+from mal2_db.models import (
+    get_screenshot_hash_fields,
+    remove_unused_screenshot,
+    Website,
+)
+
+
+################################################################################
+# BUILD SCREENSHOT DERIVATIVES
+
+class Command(BaseCommand):
+    help = "Move the screenshots of the flat legacy layout to the content addressed layout and create their WebP derivatives."
+
+    def handle(self, *args, **options):
+        websites = Website.objects.filter(
+            screenshot__isnull=False,
+        ).exclude(
+            screenshot__contains="/",
+        ).order_by("id").values_list("id", "screenshot")
+
+        count = 0
+
+        for website_id, old_name in websites.iterator():
+            if not screenshot_storage.exists(old_name):
+                continue
+
+            with screenshot_storage.open(old_name, "rb") as f:
+                png = f.read()
+
+            name, screenshot_hash = save_screenshot(png)
+
+            # only the file name changes, no need to bump "modified_at"
+            Website.objects.filter(id=website_id).update(
+                screenshot=name,
+                screenshot_hash=screenshot_hash,
+                **get_screenshot_hash_fields(screenshot_hash)
+            )
+
+            remove_unused_screenshot(old_name)
+
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS("Moved %s screenshots." % count))
@@ -0,0 +1,155 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mal2.utils import (
+    get_image_hash_chunk_neighbors,
+    get_image_hash_chunks,
+    get_image_hash_distance,
+    IMAGE_HASH_CHUNK_COUNT,
+)
+from mal2_db.constants.db import WEBSITE_STATUS_FAKE_SHOP
+from mal2_db.models import Website
+
+
+################################################################################
+# CLUSTER SCREENSHOTS
+
+class Command(BaseCommand):
+    help = "Group all websites with visually similar screenshots, e.g. fake shops deployed from the same template."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--distance",
+            default=settings.SCREENSHOT_SIMILARITY_DISTANCE,
+            type=int,
+            help="Maximum Hamming distance of the screenshot hashes of similar websites.",
+        )
+
+        parser.add_argument(
+            "--min-size",
+            default=2,
+            type=int,
+            help="Show clusters with at least this number of websites only.",
+        )
+
+        parser.add_argument(
+            "--with-fake-shops",
+            action="store_true",
+            help="Show clusters with at least one known fake shop only.",
+        )
+
+    def handle(self, *args, **options):
+        unhashed_count = Website.objects.filter(
+            screenshot__isnull=False,
+            screenshot_hash__isnull=True,
+        ).count()
+
+        if unhashed_count:
+            self.stdout.write(self.style.WARNING(
+                "%s screenshots without hash are left out, run \"hash_screenshots\" first." % unhashed_count
+            ))
+
+        websites = list(
+            Website.objects.filter(
+                screenshot_hash__isnull=False,
+            ).order_by("id").values_list("id", "url", "status", "screenshot_hash")
+        )
+
+        clusters = self.get_clusters(websites, options["distance"])
+        count = 0
+
+        for cluster in sorted(clusters, key=len, reverse=True):
+            if len(cluster) < options["min_size"]:
+                break
+
+            fake_shop_count = sum(
+                1 for i in cluster if websites[i][2] == WEBSITE_STATUS_FAKE_SHOP
+            )
+
+            if options["with_fake_shops"] and not fake_shop_count:
+                continue
+
+            count += 1
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                "Cluster %s: %s websites, %s fake shops" % (count, len(cluster), fake_shop_count)
+            ))
+
+            for i in sorted(cluster):
+                website_id, url, status, screenshot_hash = websites[i]
+                self.stdout.write("  %s %s (%s)" % (website_id, url, status))
+
+        self.stdout.write(self.style.SUCCESS("%s clusters found." % count))
+
+    def get_clusters(self, websites, max_distance):
+        """
+        Return the clusters as sets of indexes of `websites`. Websites are in
+        the same cluster if there is a chain of similar screenshots between
+        them.
+        """
+
+        # blank, error and parking pages share the same hash, each hash is
+        # compared once
+        hash_websites = defaultdict(list)
+
+        for i, (website_id, url, status, screenshot_hash) in enumerate(websites):
+            hash_websites[screenshot_hash].append(i)
+
+        hashes = list(hash_websites)
+        chunk_distance = max_distance // IMAGE_HASH_CHUNK_COUNT
+
+        # multi-index hashing, see `WebsiteQuerySet.get_similar_screenshots()`
+        chunk_indexes = [defaultdict(list) for i in range(IMAGE_HASH_CHUNK_COUNT)]
+
+        for i, screenshot_hash in enumerate(hashes):
+            for chunk_index, chunk in zip(chunk_indexes, get_image_hash_chunks(screenshot_hash)):
+                chunk_index[chunk].append(i)
+
+        parents = list(range(len(hashes)))
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+
+            return i
+
+        # buckets whose hashes are all in the same cluster, another hash of
+        # this cluster does not need to look at them again
+        merged_buckets = set()
+
+        for i, screenshot_hash in enumerate(hashes):
+            chunks = get_image_hash_chunks(screenshot_hash)
+
+            for position, (chunk_index, chunk) in enumerate(zip(chunk_indexes, chunks)):
+                for neighbor in get_image_hash_chunk_neighbors(chunk, chunk_distance):
+                    bucket = chunk_index.get(neighbor)
+
+                    if not bucket:
+                        continue
+
+                    if (position, neighbor) in merged_buckets and find(bucket[0]) == find(i):
+                        continue
+
+                    is_merged = True
+
+                    for j in bucket:
+                        if find(i) == find(j):
+                            continue
+
+                        if get_image_hash_distance(screenshot_hash, hashes[j]) <= max_distance:
+                            parents[find(j)] = find(i)
+                        else:
+                            is_merged = False
+
+                    if is_merged:
+                        merged_buckets.add((position, neighbor))
+
+        clusters = defaultdict(set)
+
+        for i, screenshot_hash in enumerate(hashes):
+            clusters[find(i)].update(hash_websites[screenshot_hash])
+
+        return list(clusters.values())
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from mal2.utils import (
+    get_image_hash,
+    screenshot_storage,
+)
+from mal2_db.models import (
+    get_screenshot_hash_fields,
+    Website,
+)
+
+
+################################################################################
+# HASH SCREENSHOTS
+
+class Command(BaseCommand):
+    help = "Hash the screenshots taken before the perceptual hashes were introduced."
+
+    def handle(self, *args, **options):
+        websites = Website.objects.filter(
+            screenshot__isnull=False,
+            screenshot_hash__isnull=True,
+        ).order_by("id").values_list("id", "screenshot")
+
+        count = 0
+
+        for website_id, name in websites.iterator():
+            if not screenshot_storage.exists(name):
+                continue
+
+            with screenshot_storage.open(name, "rb") as f, Image.open(f) as image:
+                screenshot_hash = get_image_hash(image)
+
+            # the screenshot did not change, no need to bump "modified_at"
+            Website.objects.filter(id=website_id).update(
+                screenshot_hash=screenshot_hash,
+                **get_screenshot_hash_fields(screenshot_hash)
+            )
+
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS("Hashed %s screenshots." % count))
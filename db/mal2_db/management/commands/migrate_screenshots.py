@@ -0,0 +1,80 @@
+from django.core.files.storage import get_storage_class
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from mal2.utils import (
+    get_screenshot_names,
+    screenshot_storage,
+)
+from mal2_db.models import Website
+
+
+################################################################################
+# MIGRATE SCREENSHOTS
+
+class Command(BaseCommand):
+    help = "Copy the screenshots of all websites from another storage backend to SCREENSHOT_STORAGE, e.g. from the local file system to S3."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default="mal2.utils.ScreenshotFileSystemStorage",
+            help="Dotted path of the storage class to copy from.",
+        )
+        parser.add_argument(
+            "--source-option",
+            action="append",
+            default=[],
+            dest="source_options",
+            help="KEY=VALUE option of the source storage, e.g. location=/srv/screenshots. Can be repeated.",
+            metavar="KEY=VALUE",
+        )
+
+    def handle(self, *args, **options):
+        source_options = {}
+
+        for option in options["source_options"]:
+            key, separator, value = option.partition("=")
+
+            if not separator:
+                raise CommandError("Invalid source option: %s" % option)
+
+            source_options[key] = value
+
+        source_storage = get_storage_class(options["source"])(**source_options)
+
+        names = Website.objects.filter(
+            screenshot__isnull=False,
+        ).exclude(
+            screenshot="",
+        ).order_by("screenshot").values_list("screenshot", flat=True).distinct()
+
+        copied = 0
+        missing = 0
+
+        for name in names.iterator():
+            # screenshots of the flat legacy layout have no derivatives
+            screenshot_names = get_screenshot_names(name) if "/" in name else [name]
+
+            for screenshot_name in screenshot_names:
+                # content addressed files never change, so existing files are
+                # skipped and an interrupted migration can be resumed
+                if screenshot_storage.exists(screenshot_name):
+                    continue
+
+                if not source_storage.exists(screenshot_name):
+                    missing += 1
+
+                    continue
+
+                # the file is streamed in chunks, not read into memory
+                with source_storage.open(screenshot_name, "rb") as f:
+                    screenshot_storage.save(screenshot_name, f)
+
+                copied += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            "Copied %s files, %s missing in the source storage." % (copied, missing)
+        ))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mal2_db.utils import run_screenshot_workers
+
+
+################################################################################
+# PROCESS SCREENSHOTS
+
+class Command(BaseCommand):
+    help = "Take the queued website screenshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            default=settings.SCREENSHOT_JOB_CONCURRENCY,
+            type=int,
+            help="Number of screenshots taken at the same time.",
+        )
+
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as no job is due instead of waiting for new jobs.",
+        )
+
+    def handle(self, *args, **options):
+        run_screenshot_workers(
+            concurrency=options["concurrency"],
+            once=options["once"],
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from mal2_db.utils import publish_blocklist
+
+
+################################################################################
+# PUBLISH BLOCKLIST
+
+class Command(BaseCommand):
+    help = "Publish a new snapshot of the fake shop and counterfeiter hosts if they changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Publish a new version even if nothing changed.",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = publish_blocklist(force=options["force"])
+
+        if snapshot is None:
+            self.stdout.write("Blocklist unchanged.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                "Published blocklist version %s with %s hosts." % (
+                    snapshot.version,
+                    snapshot.host_count,
+                )
+            ))
@@ -0,0 +1,177 @@
+import multiprocessing
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from mal2_db.models import (
+    ScreenshotJob,
+    Website,
+)
+from mal2_db.utils import (
+    enqueue_recaptures,
+    run_screenshot_workers,
+)
+
+
+################################################################################
+# RECAPTURE SCREENSHOTS
+
+QUEUES = (
+    "to_check",
+    "without_verification",
+    "unsure",
+    "disagreement",
+    "is_fake_shop",
+    "is_brand_counterfeiter",
+    "is_no_fake",
+    "is_other_sites",
+    "is_online_shop",
+)
+
+
+class Command(BaseCommand):
+    help = "Take new screenshots of many websites at once, e.g. to keep evidence of fake shops before they go offline."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            choices=QUEUES,
+            help="Recapture the websites of this queue only.",
+        )
+
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            metavar="DAYS",
+            help="Recapture websites without screenshot or with a screenshot older than DAYS days only.",
+        )
+
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Recapture at most this number of websites, the newest first.",
+        )
+
+        parser.add_argument(
+            "--processes",
+            default=1,
+            type=int,
+            help="Number of worker processes.",
+        )
+
+        parser.add_argument(
+            "--concurrency",
+            default=settings.SCREENSHOT_JOB_CONCURRENCY,
+            type=int,
+            help="Number of screenshots taken at the same time per process.",
+        )
+
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Do not queue websites, only finish the recaptures of an interrupted run.",
+        )
+
+        parser.add_argument(
+            "--report-interval",
+            default=10,
+            type=int,
+            help="Seconds between two progress reports.",
+        )
+
+    def handle(self, *args, **options):
+        started_at = timezone.now()
+
+        if not options["resume"]:
+            websites = Website.objects.all()
+
+            if options["queue"]:
+                websites = getattr(websites, options["queue"])()
+
+            if options["older_than"] is not None:
+                websites = websites.filter(
+                    Q(screenshot_at__isnull=True)
+                    | Q(screenshot_at__lt=started_at - timedelta(days=options["older_than"]))
+                )
+
+            websites = websites.order_by("-id")
+
+            if options["limit"]:
+                websites = websites[:options["limit"]]
+
+            self.stdout.write("Queued %s websites." % enqueue_recaptures(websites))
+
+        jobs = ScreenshotJob.objects.filter(
+            recapture=True,
+        ).exclude(
+            status=ScreenshotJob.STATUS_FAILED,
+        )
+
+        total = jobs.count()
+
+        # the processes must not share the connection of this process
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(
+                target=run_screenshot_workers,
+                kwargs={
+                    "concurrency": options["concurrency"],
+                    "once": True,
+                },
+            )
+            for i in range(options["processes"])
+        ]
+
+        for process in processes:
+            process.start()
+
+        try:
+            while any(process.is_alive() for process in processes):
+                for process in processes:
+                    process.join(options["report_interval"] / len(processes))
+
+                self.report(jobs, total, started_at)
+        except KeyboardInterrupt:
+            # the processes finish their running screenshots first
+            for process in processes:
+                process.join()
+
+            self.stdout.write(self.style.WARNING(
+                "Interrupted, continue with --resume."
+            ))
+
+            return
+
+        remaining = jobs.count()
+
+        if remaining:
+            self.stdout.write(self.style.WARNING(
+                "%s websites wait for a retry, continue with --resume." % remaining
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("Recapture finished."))
+
+    def report(self, jobs, total, started_at):
+        remaining = jobs.count()
+        failed = ScreenshotJob.objects.filter(
+            recapture=True,
+            status=ScreenshotJob.STATUS_FAILED,
+            modified_at__gte=started_at,
+        ).count()
+
+        processed = total - remaining
+        minutes = max((timezone.now() - started_at).total_seconds() / 60, 1 / 60)
+
+        self.stdout.write(
+            "%s of %s processed (%s failed), %.1f websites per minute" % (
+                processed,
+                total,
+                failed,
+                processed / minutes,
+            )
+        )
@@ -0,0 +1,212 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mal2.utils import (
+    format_file_size,
+    screenshot_storage,
+)
+from mal2_db.models import (
+    User,
+    Website,
+)
+
+
+################################################################################
+# REMOVE ORPHANED FILES
+
+# number of files checked against the database with one query
+BATCH_SIZE = 1000
+
+DERIVATIVE_SUFFIXES = (
+    ".thumb.webp",
+    ".webp",
+)
+
+
+def scan_files(path):
+    """
+    Yield the `os.DirEntry` of every file below `path`. Directories are read
+    one at a time, so the memory usage does not depend on the number of
+    files.
+    """
+
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from scan_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    except FileNotFoundError:
+        pass
+
+
+def get_batches(items, size=BATCH_SIZE):
+    batch = []
+
+    for item in items:
+        batch.append(item)
+
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def get_screenshot_reference(name):
+    """
+    Return the screenshot name a website references if the file is in use,
+    derivatives belong to the PNG of the same name.
+    """
+
+    # screenshots of the flat legacy layout have no derivatives
+    if "/" in name:
+        for suffix in DERIVATIVE_SUFFIXES:
+            if name.endswith(suffix):
+                return "%s.png" % name[:-len(suffix)]
+
+    return name
+
+
+class Command(BaseCommand):
+    help = "Remove screenshots that no website references and media folders of deleted users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the orphaned files.",
+        )
+
+        parser.add_argument(
+            "--quarantine",
+            metavar="PATH",
+            help="Move the orphaned files to this folder instead of deleting them.",
+        )
+
+        parser.add_argument(
+            "--min-age",
+            default=24,
+            type=int,
+            metavar="HOURS",
+            help="Keep files modified within this number of hours, they may be referenced in a moment.",
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.quarantine = options["quarantine"]
+        self.verbosity = options["verbosity"]
+
+        # screenshots are saved before a website references them
+        self.modified_before = time.time() - options["min_age"] * 3600
+
+        try:
+            screenshots_path = screenshot_storage.path("")
+        except NotImplementedError:
+            screenshots_path = None
+
+            self.stdout.write("SCREENSHOT_STORAGE is not local, screenshots are not checked.")
+
+        if screenshots_path:
+            self.report("Screenshots", *self.remove_orphaned_screenshots(screenshots_path))
+
+        self.report("Media", *self.remove_orphaned_media(settings.MEDIA_ROOT))
+
+    def report(self, title, scanned, count, size):
+        self.stdout.write(self.style.SUCCESS(
+            "%s: %s files scanned, %s orphaned files (%s) %s." % (
+                title,
+                scanned,
+                count,
+                format_file_size(size),
+                "found" if self.dry_run else "quarantined" if self.quarantine else "removed",
+            )
+        ))
+
+    def remove_orphaned_screenshots(self, path):
+        scanned = count = size = 0
+
+        for batch in get_batches(scan_files(path)):
+            scanned += len(batch)
+
+            references = {
+                entry.path: get_screenshot_reference(os.path.relpath(entry.path, path).replace(os.sep, "/"))
+                for entry in batch
+            }
+
+            referenced = set(
+                Website._base_manager.filter(
+                    screenshot__in=set(references.values()),
+                ).values_list("screenshot", flat=True)
+            )
+
+            for entry in batch:
+                if references[entry.path] not in referenced:
+                    count, size = self.remove(entry, path, "screenshots", count, size)
+
+        return scanned, count, size
+
+    def remove_orphaned_media(self, path):
+        """
+        Uploads are stored in a folder per user id, the folders of deleted
+        users are orphaned. Other folders are left alone.
+        """
+
+        scanned = count = size = 0
+
+        try:
+            with os.scandir(path) as entries:
+                user_folders = (
+                    entry for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and entry.name.isdigit()
+                )
+
+                for batch in get_batches(user_folders):
+                    user_ids = set(
+                        User.objects.filter(
+                            id__in=[int(entry.name) for entry in batch],
+                        ).values_list("id", flat=True)
+                    )
+
+                    for folder in batch:
+                        if int(folder.name) in user_ids:
+                            continue
+
+                        for entry in scan_files(folder.path):
+                            scanned += 1
+                            count, size = self.remove(entry, path, "media", count, size)
+        except FileNotFoundError:
+            pass
+
+        return scanned, count, size
+
+    def remove(self, entry, root, quarantine_folder, count, size):
+        stat = entry.stat(follow_symlinks=False)
+
+        if stat.st_mtime >= self.modified_before:
+            return count, size
+
+        if self.verbosity >= 2:
+            self.stdout.write("  %s (%s)" % (entry.path, format_file_size(stat.st_size)))
+
+        if not self.dry_run:
+            if self.quarantine:
+                quarantine_path = os.path.join(
+                    self.quarantine,
+                    quarantine_folder,
+                    os.path.relpath(entry.path, root),
+                )
+                os.makedirs(os.path.dirname(quarantine_path), exist_ok=True)
+
+                # works across file systems, unlike `os.replace()`
+                shutil.move(entry.path, quarantine_path)
+            else:
+                os.remove(entry.path)
+
+        return count + 1, size + stat.st_size
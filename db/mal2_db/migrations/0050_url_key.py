@@ -0,0 +1,28 @@
+# Generated by Django 2.2.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0049_auto_20201210_1407'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mal2counterfeitersdb',
+            name='url_key',
+            field=models.CharField(db_index=True, editable=False, max_length=2000, null=True, verbose_name='URL key'),
+        ),
+        migrations.AddField(
+            model_name='mal2fakeshopdb',
+            name='url_key',
+            field=models.CharField(db_index=True, editable=False, max_length=2000, null=True, verbose_name='URL key'),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='url_key',
+            field=models.CharField(editable=False, max_length=2000, null=True, verbose_name='URL key'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.4 on 2026-10-18 09:14
+
+from django.db import migrations
+
+from mal2.utils import get_url_key
+
+
+BATCH_SIZE = 1000
+
+
+def fill_url_keys(apps, schema_editor):
+    for model_name in ("Website", "mal2FakeShopDB", "mal2CounterfeitersDB"):
+        model = apps.get_model("mal2_db", model_name)
+        is_unique = model_name == "Website"
+
+        seen_url_keys = set()
+        instances = []
+
+        for instance in model.objects.order_by("id").only("id", "url").iterator(chunk_size=BATCH_SIZE):
+            url_key = get_url_key(instance.url)
+
+            # the oldest website keeps the key of duplicated urls, all others
+            # stay without key to satisfy the unique constraint
+            if is_unique:
+                if url_key in seen_url_keys:
+                    url_key = None
+                else:
+                    seen_url_keys.add(url_key)
+
+            instance.url_key = url_key
+            instances.append(instance)
+
+            if len(instances) >= BATCH_SIZE:
+                model.objects.bulk_update(instances, ["url_key"])
+                instances = []
+
+        if instances:
+            model.objects.bulk_update(instances, ["url_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0050_url_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_url_keys, migrations.RunPython.noop),
+    ]
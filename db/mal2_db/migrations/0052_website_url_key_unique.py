@@ -0,0 +1,18 @@
+# Generated by Django 2.2.4 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0051_fill_url_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='website',
+            name='url_key',
+            field=models.CharField(editable=False, max_length=2000, null=True, unique=True, verbose_name='URL key'),
+        ),
+    ]
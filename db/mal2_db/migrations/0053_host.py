@@ -0,0 +1,28 @@
+# Generated by Django 2.2.4 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0052_website_url_key_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mal2counterfeitersdb',
+            name='host',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Host'),
+        ),
+        migrations.AddField(
+            model_name='mal2fakeshopdb',
+            name='host',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Host'),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='host',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Host'),
+        ),
+    ]
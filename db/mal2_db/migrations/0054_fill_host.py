@@ -0,0 +1,36 @@
+# Generated by Django 2.2.4 on 2026-10-18 10:03
+
+from django.db import migrations
+
+from mal2.utils import get_url_host
+
+
+BATCH_SIZE = 1000
+
+
+def fill_hosts(apps, schema_editor):
+    for model_name in ("Website", "mal2FakeShopDB", "mal2CounterfeitersDB"):
+        model = apps.get_model("mal2_db", model_name)
+        instances = []
+
+        for instance in model.objects.order_by("id").only("id", "url").iterator(chunk_size=BATCH_SIZE):
+            instance.host = get_url_host(instance.url)
+            instances.append(instance)
+
+            if len(instances) >= BATCH_SIZE:
+                model.objects.bulk_update(instances, ["host"])
+                instances = []
+
+        if instances:
+            model.objects.bulk_update(instances, ["host"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0053_host'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_hosts, migrations.RunPython.noop),
+    ]
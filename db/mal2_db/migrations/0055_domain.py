@@ -0,0 +1,28 @@
+# Generated by Django 2.2.4 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0054_fill_host'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mal2counterfeitersdb',
+            name='domain',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Domain'),
+        ),
+        migrations.AddField(
+            model_name='mal2fakeshopdb',
+            name='domain',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Domain'),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='domain',
+            field=models.CharField(db_index=True, editable=False, max_length=255, null=True, verbose_name='Domain'),
+        ),
+    ]
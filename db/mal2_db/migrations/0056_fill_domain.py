@@ -0,0 +1,36 @@
+# Generated by Django 2.2.4 on 2026-10-18 11:21
+
+from django.db import migrations
+
+from mal2.utils import get_registrable_domain
+
+
+BATCH_SIZE = 1000
+
+
+def fill_domains(apps, schema_editor):
+    for model_name in ("Website", "mal2FakeShopDB", "mal2CounterfeitersDB"):
+        model = apps.get_model("mal2_db", model_name)
+        instances = []
+
+        for instance in model.objects.order_by("id").only("id", "host").iterator(chunk_size=BATCH_SIZE):
+            instance.domain = get_registrable_domain(instance.host)
+            instances.append(instance)
+
+            if len(instances) >= BATCH_SIZE:
+                model.objects.bulk_update(instances, ["domain"])
+                instances = []
+
+        if instances:
+            model.objects.bulk_update(instances, ["domain"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0055_domain'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_domains, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.4 on 2026-10-18 12:05
+
+from django.db import migrations, models
+import mal2.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0056_fill_domain'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlocklistSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', mal2.models.fields.CreationDateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('modified_at', mal2.models.fields.ModificationDateTimeField(auto_now=True, verbose_name='Modified at')),
+                ('version', models.PositiveIntegerField(unique=True, verbose_name='Version')),
+                ('host_count', models.PositiveIntegerField(default=0, verbose_name='Host count')),
+                ('checksum', models.CharField(help_text='SHA-256 of the uncompressed snapshot', max_length=64, verbose_name='Checksum')),
+            ],
+            options={
+                'verbose_name': 'Blocklist snapshot',
+                'verbose_name_plural': 'Blocklist snapshots',
+                'ordering': ('-version',),
+            },
+        ),
+    ]
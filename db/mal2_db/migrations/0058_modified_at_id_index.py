@@ -0,0 +1,25 @@
+# Generated by Django 2.2.4 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0057_blocklistsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mal2counterfeitersdb',
+            index=models.Index(fields=['modified_at', 'id'], name='mal2_db_mal_modifie_481972_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mal2fakeshopdb',
+            index=models.Index(fields=['modified_at', 'id'], name='mal2_db_mal_modifie_148705_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(fields=['modified_at', 'id'], name='mal2_db_web_modifie_2f0aeb_idx'),
+        ),
+    ]
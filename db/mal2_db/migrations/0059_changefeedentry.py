@@ -0,0 +1,30 @@
+# Generated by Django 2.2.4 on 2026-10-18 14:02
+
+from django.db import migrations, models
+import mal2.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0058_modified_at_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', mal2.models.fields.CreationDateTimeField(auto_now_add=True, db_index=True, verbose_name='Created at')),
+                ('model_name', models.CharField(max_length=50, verbose_name='Model name')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Object ID')),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10, verbose_name='Action')),
+                ('url', models.CharField(max_length=2000, null=True, verbose_name='URL')),
+            ],
+            options={
+                'verbose_name': 'Change feed entry',
+                'verbose_name_plural': 'Change feed entries',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0059_changefeedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('fake_shop', 'Fake shop'), ('counterfeiter', 'Brand counterfeiter')], default='open', editable=False, max_length=20, verbose_name='Status'),
+        ),
+    ]
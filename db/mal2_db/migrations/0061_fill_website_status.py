@@ -0,0 +1,34 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:11
+
+from django.db import migrations
+from django.db.models import (
+    Exists,
+    OuterRef,
+)
+
+
+def fill_website_status(apps, schema_editor):
+    Website = apps.get_model("mal2_db", "Website")
+    mal2FakeShopDB = apps.get_model("mal2_db", "mal2FakeShopDB")
+    mal2CounterfeitersDB = apps.get_model("mal2_db", "mal2CounterfeitersDB")
+
+    # fake shops last, a website in both databases counts as fake shop
+    for model, status in ((mal2CounterfeitersDB, "counterfeiter"), (mal2FakeShopDB, "fake_shop")):
+        Website.objects.annotate(
+            is_listed=Exists(model.objects.filter(url=OuterRef("url"))),
+        ).filter(
+            is_listed=True,
+        ).update(
+            status=status,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0060_website_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_website_status, migrations.RunPython.noop),
+    ]
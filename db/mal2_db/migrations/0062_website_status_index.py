@@ -0,0 +1,50 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0061_fill_website_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), models.Q(('website_type__isnull', True), ('website_type', 2), ('website_type', 3), _connector='OR')), fields=['id'], name='website_to_check_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), ('website_type', 1)), fields=['id'], name='website_no_verification_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), ('website_type', 5)), fields=['id'], name='website_unsure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), ('website_type', 4)), fields=['id'], name='website_no_fake_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), ('website_category', 3)), fields=['id'], name='website_other_sites_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(('status', 'open'), ('website_category', 2)), fields=['id'], name='website_online_shop_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(status='open'), fields=['id'], name='website_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(status='fake_shop'), fields=['id'], name='website_fake_shop_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(condition=models.Q(status='counterfeiter'), fields=['id'], name='website_counterfeiter_idx'),
+        ),
+    ]
+
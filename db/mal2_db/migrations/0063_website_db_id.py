@@ -0,0 +1,18 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0062_website_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='db_id',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='DB ID'),
+        ),
+    ]
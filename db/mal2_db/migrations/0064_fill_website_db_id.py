@@ -0,0 +1,36 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:41
+
+from django.db import migrations
+from django.db.models import (
+    OuterRef,
+    Subquery,
+)
+
+
+def fill_website_db_ids(apps, schema_editor):
+    Website = apps.get_model("mal2_db", "Website")
+    mal2FakeShopDB = apps.get_model("mal2_db", "mal2FakeShopDB")
+    mal2CounterfeitersDB = apps.get_model("mal2_db", "mal2CounterfeitersDB")
+
+    # fake shops last, their id wins over the counterfeiter id
+    for model in (mal2CounterfeitersDB, mal2FakeShopDB):
+        db_ids = model.objects.filter(
+            website_id=OuterRef("id"),
+        ).order_by("id").values("id")[:1]
+
+        Website.objects.filter(
+            id__in=model.objects.values("website_id"),
+        ).update(
+            db_id=Subquery(db_ids),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0063_website_db_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_website_db_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.4 on 2026-10-18 16:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import mal2.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0064_fill_website_db_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', editable=False, max_length=10, verbose_name='Screenshot status'),
+        ),
+        migrations.CreateModel(
+            name='ScreenshotJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', mal2.models.fields.CreationDateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('modified_at', mal2.models.fields.ModificationDateTimeField(auto_now=True, verbose_name='Modified at')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Run after')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('website', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='screenshot_job', to='mal2_db.Website', verbose_name='Website')),
+            ],
+            options={
+                'verbose_name': 'Screenshot job',
+                'verbose_name_plural': 'Screenshot jobs',
+                'ordering': ('run_after',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='screenshotjob',
+            index=models.Index(fields=['status', 'run_after'], name='mal2_db_scr_status_f16a26_idx'),
+        ),
+    ]
+
@@ -0,0 +1,22 @@
+# Generated by Django 2.2.4 on 2026-10-18 16:06
+
+from django.db import migrations
+
+
+def fill_screenshot_status(apps, schema_editor):
+    Website = apps.get_model("mal2_db", "Website")
+
+    # screenshots used to be taken while saving, there is nothing to retry
+    Website.objects.filter(screenshot__isnull=False).update(screenshot_status="done")
+    Website.objects.filter(screenshot__isnull=True).update(screenshot_status="failed")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0065_screenshotjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_screenshot_status, migrations.RunPython.noop),
+    ]
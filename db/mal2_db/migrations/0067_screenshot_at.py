@@ -0,0 +1,24 @@
+# Generated by Django 2.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0066_fill_screenshot_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screenshotjob',
+            name='recapture',
+            field=models.BooleanField(default=False, verbose_name='Recapture'),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_at',
+            field=models.DateTimeField(db_index=True, editable=False, null=True, verbose_name='Screenshot taken at'),
+        ),
+    ]
+
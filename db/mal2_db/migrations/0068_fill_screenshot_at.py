@@ -0,0 +1,43 @@
+# Generated by Django 2.2.4 on 2026-10-18 16:41
+
+import datetime
+import os
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def fill_screenshot_at(apps, schema_editor):
+    Website = apps.get_model("mal2_db", "Website")
+    websites = []
+
+    for website in Website.objects.filter(screenshot__isnull=False).order_by("id").only("id", "screenshot").iterator(chunk_size=BATCH_SIZE):
+        path = os.path.join(settings.SCREENSHOTS_PATH, website.screenshot)
+
+        if not os.path.exists(path):
+            continue
+
+        website.screenshot_at = datetime.datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc)
+        websites.append(website)
+
+        if len(websites) >= BATCH_SIZE:
+            Website.objects.bulk_update(websites, ["screenshot_at"])
+            websites = []
+
+    if websites:
+        Website.objects.bulk_update(websites, ["screenshot_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0067_screenshot_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_screenshot_at, migrations.RunPython.noop),
+    ]
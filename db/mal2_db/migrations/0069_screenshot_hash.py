@@ -0,0 +1,39 @@
+# Generated by Django 2.2.4 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0068_fill_screenshot_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_hash',
+            field=models.CharField(editable=False, max_length=16, null=True, verbose_name='Screenshot hash'),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_hash_0',
+            field=models.PositiveIntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_hash_1',
+            field=models.PositiveIntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_hash_2',
+            field=models.PositiveIntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='screenshot_hash_3',
+            field=models.PositiveIntegerField(db_index=True, editable=False, null=True),
+        ),
+    ]
+
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.4 on 2026-10-18 17:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0069_screenshot_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebsiteFetchState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status_code', models.PositiveSmallIntegerField(null=True, verbose_name='Status code')),
+                ('etag', models.CharField(blank=True, max_length=255, verbose_name='ETag')),
+                ('last_modified', models.CharField(blank=True, max_length=64, verbose_name='Last modified')),
+                ('content_hash', models.CharField(blank=True, max_length=64, verbose_name='Content hash')),
+                ('checked_at', models.DateTimeField(null=True, verbose_name='Checked at')),
+                ('changed_at', models.DateTimeField(null=True, verbose_name='Changed at')),
+                ('website', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fetch_state', to='mal2_db.Website', verbose_name='Website')),
+            ],
+            options={
+                'verbose_name': 'Website fetch state',
+                'verbose_name_plural': 'Website fetch states',
+            },
+        ),
+    ]
+
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.4 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0070_websitefetchstate'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='website',
+            name='screenshot',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Screenshot'),
+        ),
+    ]
+
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.4 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0071_website_screenshot_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changefeedentry',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, null=True, unique=True, verbose_name='Sequence'),
+        ),
+    ]
+
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.4 on 2026-10-18 18:21
+
+from django.db import migrations
+from django.db.models import F
+
+
+def fill_change_feed_sequence(apps, schema_editor):
+    ChangeFeedEntry = apps.get_model("mal2_db", "ChangeFeedEntry")
+
+    # the existing entries were written after the commit, the id is their
+    # sequence number and the cursors of the readers stay valid
+    ChangeFeedEntry.objects.update(sequence=F("id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mal2_db', '0072_changefeedentry_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_change_feed_sequence, migrations.RunPython.noop),
+    ]
@@ -1,2 +1,5 @@
 from mal2_db.models.base import *  # noqa
+from mal2_db.models.blocklist import *  # noqa
+from mal2_db.models.change_feed import *  # noqa
 from mal2_db.models.registration import *  # noqa
+from mal2_db.models.screenshot import *  # noqa
@@ -1,32 +1,274 @@
-import os
 
-from django.conf import settings
 from django.core import validators
-from django.db import models
+from django.db import (
+    models,
+    transaction,
+)
 from django.db.models import (
     F,
     Q,
 )
-from django.db.models.functions import (
-    Coalesce,
-)
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from mal2.models import AuthTimeStampedModel
-from mal2.utils import remove_url_protocol
+from mal2.utils import (
+    IMAGE_HASH_CHUNK_COUNT,
+    get_image_hash_chunk_neighbors,
+    get_image_hash_chunks,
+    get_image_hash_distance,
+    get_registrable_domain,
+    get_url_host,
+    get_url_key,
+    remove_screenshot,
+    remove_url_protocol,
+)
 from mal2_db.constants.db import (
     DB_COUNTERFEITE,
     DB_FAKE_SHOP,
     DB_NO_FAKE,
     DB_NO_VERIFICATION_NECESSARY,
     DB_UNSURE,
+    SCREENSHOT_STATUS_DONE,
+    SCREENSHOT_STATUS_FAILED,
+    SCREENSHOT_STATUS_PENDING,
+    VERDICT_COUNTERFEITER,
+    VERDICT_FAKE_SHOP,
+    VERDICT_NO_FAKE,
+    VERDICT_UNKNOWN,
+    VERDICT_UNSURE,
+    VERDICTS,
     WEBSITE_CATEGORY_ONLINE_SHOP,
     WEBSITE_CATEGORY_OTHER,
     WEBSITE_CATEGORY_UNKNOWN,
+    WEBSITE_STATUS_COUNTERFEITER,
+    WEBSITE_STATUS_FAKE_SHOP,
+    WEBSITE_STATUS_OPEN,
 )
+from mal2_db.models.change_feed import ChangeFeedEntry
 from mal2_db.models.registration import User
 
 
+################################################################################
+# URL KEY
+
+class URLKeyModel(models.Model):
+    """
+    An abstract base class model that stores the canonical key, the
+    normalized host and the registrable domain of the "url" field (see
+    `mal2.utils.get_url_key()`, `mal2.utils.get_url_host()` and
+    `mal2.utils.get_registrable_domain()`) for indexed lookups.
+    """
+
+    domain = models.CharField(
+        db_index=True,
+        editable=False,
+        max_length=255,
+        null=True,
+        verbose_name=_("Domain"),
+    )
+
+    host = models.CharField(
+        db_index=True,
+        editable=False,
+        max_length=255,
+        null=True,
+        verbose_name=_("Host"),
+    )
+
+    url_key = models.CharField(
+        db_index=True,
+        editable=False,
+        max_length=2000,
+        null=True,
+        verbose_name=_("URL key"),
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        url_key = get_url_key(self.url)
+
+        # legacy duplicates of an unique url key were left without key (see
+        # migration "0051_fill_url_key"), they keep it that way
+        if self.pk and self.url_key is None and url_key and self._meta.get_field("url_key").unique:
+            if type(self)._base_manager.filter(url_key=url_key).exclude(pk=self.pk).exists():
+                url_key = None
+
+        self.host = get_url_host(self.url)
+        self.domain = get_registrable_domain(self.host)
+        self.url_key = url_key
+
+        super().save(*args, **kwargs)
+
+
+################################################################################
+# SCREENSHOT HASH
+
+def get_screenshot_hash_fields(screenshot_hash):
+    """
+    Return the values of the chunk fields of a screenshot hash.
+    """
+
+    chunks = get_image_hash_chunks(screenshot_hash) if screenshot_hash else [None] * IMAGE_HASH_CHUNK_COUNT
+
+    return {
+        "screenshot_hash_%s" % i: chunk for i, chunk in enumerate(chunks)
+    }
+
+
+def remove_unused_screenshot(name):
+    """
+    Remove the screenshot files unless another website has the same
+    screenshot.
+    """
+
+    if name and not Website._base_manager.filter(screenshot=name).exists():
+        remove_screenshot(name)
+
+
+################################################################################
+# WEBSITE STATUS
+
+def add_website_change_feed_entry(website_id, url):
+    """
+    `update()` sends no signals, the change feed entry of the website is
+    written here.
+    """
+
+    ChangeFeedEntry.objects.create(
+        model_name=Website._meta.model_name,
+        object_id=website_id,
+        action=ChangeFeedEntry.ACTION_UPDATED,
+        url=url,
+    )
+
+
+def get_website_status(url):
+    """
+    Return the status of a website with the given url. A website whose url
+    is in both databases counts as fake shop.
+    """
+
+    url_key = get_url_key(url)
+
+    if mal2FakeShopDB.objects.filter(url_key=url_key, url=url).exists():
+        return WEBSITE_STATUS_FAKE_SHOP
+
+    if mal2CounterfeitersDB.objects.filter(url_key=url_key, url=url).exists():
+        return WEBSITE_STATUS_COUNTERFEITER
+
+    return WEBSITE_STATUS_OPEN
+
+
+def update_website_status(*urls):
+    """
+    Update the status of the websites with the given urls. `modified_at` is
+    updated too, so the change is visible to incremental readers.
+    """
+
+    urls = set(url for url in urls if url)
+
+    if not urls:
+        return
+
+    # the indexed host, legacy duplicates have no url key (see migration
+    # "0051_fill_url_key")
+    websites = Website._base_manager.filter(
+        host__in=set(get_url_host(url) for url in urls),
+        url__in=urls,
+    ).values_list("id", "url", "status")
+
+    for website_id, url, status in websites:
+        new_status = get_website_status(url)
+
+        if new_status != status:
+            Website._base_manager.filter(id=website_id).update(
+                status=new_status,
+                modified_at=timezone.now(),
+            )
+
+            add_website_change_feed_entry(website_id, url)
+
+
+def get_website_db_id(website_id):
+    """
+    Return the id of the fake shop or else the counterfeiter assessment of a
+    website, the first one if there are several.
+    """
+
+    for model in (mal2FakeShopDB, mal2CounterfeitersDB):
+        db_id = model._base_manager.filter(
+            website_id=website_id,
+        ).order_by("id").values_list("id", flat=True).first()
+
+        if db_id is not None:
+            return db_id
+
+    return None
+
+
+def update_website_db_id(*website_ids):
+    """
+    Update the `db_id` of the websites with the given ids.
+    """
+
+    website_ids = set(website_id for website_id in website_ids if website_id)
+
+    if not website_ids:
+        return
+
+    websites = Website._base_manager.filter(
+        id__in=website_ids,
+    ).values_list("id", "url", "db_id")
+
+    for website_id, url, db_id in websites:
+        new_db_id = get_website_db_id(website_id)
+
+        if new_db_id != db_id:
+            Website._base_manager.filter(id=website_id).update(
+                db_id=new_db_id,
+                modified_at=timezone.now(),
+            )
+
+            add_website_change_feed_entry(website_id, url)
+
+
+class WebsiteStatusModel(models.Model):
+    """
+    An abstract base class model that keeps the status of the website with
+    the same url and the `db_id` of the linked website up to date.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            old_url = None
+            old_website_id = None
+
+            if self.pk:
+                old_url, old_website_id = type(self)._base_manager.filter(
+                    pk=self.pk,
+                ).values_list("url", "website_id").first() or (None, None)
+
+            super().save(*args, **kwargs)
+
+            update_website_status(old_url, self.url)
+            update_website_db_id(old_website_id, self.website_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+
+            update_website_status(self.url)
+            update_website_db_id(self.website_id)
+
+        return result
+
+
 ################################################################################
 # WEBSITE
 
@@ -110,86 +352,180 @@ class WebsiteType(models.Model):
 
 class WebsiteQuerySet(models.QuerySet):
     def to_check(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
+        return self.filter(
             Q(website_type_id__isnull=True)
             | Q(website_type_id=DB_FAKE_SHOP)
-            | Q(website_type_id=DB_COUNTERFEITE)
+            | Q(website_type_id=DB_COUNTERFEITE),
+            status=WEBSITE_STATUS_OPEN,
         )
 
     def without_verification(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
-            website_type_id=DB_NO_VERIFICATION_NECESSARY
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
+            website_type_id=DB_NO_VERIFICATION_NECESSARY,
         )
 
     def unsure(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
-            website_type_id=DB_UNSURE
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
+            website_type_id=DB_UNSURE,
         )
 
     def disagreement(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
         ).filter(
             ~Q(website_category=F("website_type__default_category"))
         )
 
     def is_fake_shop(self):
         return self.filter(
-            url__in=mal2FakeShopDB.objects.values_list("url")
+            status=WEBSITE_STATUS_FAKE_SHOP,
         )
 
     def is_brand_counterfeiter(self):
         return self.filter(
-            url__in=mal2CounterfeitersDB.objects.values_list("url")
+            status=WEBSITE_STATUS_COUNTERFEITER,
         )
 
     def is_no_fake(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
-            website_type_id=DB_NO_FAKE
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
+            website_type_id=DB_NO_FAKE,
         )
 
     def is_other_sites(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
             website_category_id=WEBSITE_CATEGORY_OTHER,
         )
 
     def is_online_shop(self):
-        return self.exclude(
-            Q(url__in=mal2FakeShopDB.objects.values_list("url"))
-            | Q(url__in=mal2CounterfeitersDB.objects.values_list("url"))
-        ).filter(
+        return self.filter(
+            status=WEBSITE_STATUS_OPEN,
             website_category_id=WEBSITE_CATEGORY_ONLINE_SHOP,
         )
 
-
-class WebsiteManager(models.Manager):
-    def get_queryset(self):
-        return WebsiteQuerySet(self.model, using=self._db).annotate(
-            db_id=Coalesce(
-                F("mal2fakeshopdb__id"),
-                F("mal2counterfeitersdb__id"),
-            ),
+    def get_similar_screenshots(self, screenshot_hash, max_distance):
+        """
+        Return a list of (website, distance) tuples of the websites whose
+        screenshot hash is within the Hamming distance, closest first.
+
+        Multi-index hashing: if two hashes differ in at most `max_distance`
+        bits, at least one of their chunks differs in at most
+        `max_distance // IMAGE_HASH_CHUNK_COUNT` bits. Only websites with
+        such a chunk are fetched with the indexed chunk fields.
+        """
+
+        chunk_distance = max_distance // IMAGE_HASH_CHUNK_COUNT
+        condition = Q()
+
+        for i, chunk in enumerate(get_image_hash_chunks(screenshot_hash)):
+            condition |= Q(**{
+                "screenshot_hash_%s__in" % i: get_image_hash_chunk_neighbors(chunk, chunk_distance),
+            })
+
+        similar_websites = []
+
+        for website in self.filter(condition):
+            distance = get_image_hash_distance(screenshot_hash, website.screenshot_hash)
+
+            if distance <= max_distance:
+                similar_websites.append((website, distance))
+
+        return sorted(similar_websites, key=lambda item: (item[1], -item[0].id))
+
+    def get_verdicts(self, hosts):
+        """
+        Return a dict with the verdict of every given host (see
+        `mal2.utils.get_url_host()`) resolved with a single query. Hosts
+        without website get the verdict "unknown".
+        """
+
+        verdicts = dict.fromkeys(hosts, VERDICT_UNKNOWN)
+
+        if verdicts:
+            verdicts.update(
+                self.filter(host__in=verdicts.keys()).iter_host_verdicts()
+            )
+
+        return verdicts
+
+    def iter_host_verdicts(self, chunk_size=2000):
+        """
+        Yield a (host, verdict) tuple for every host of the websites, ordered
+        by host. If several websites share a host, the most severe verdict
+        wins (see `mal2_db.constants.db.VERDICTS`).
+        """
+
+        websites = self.filter(
+            host__isnull=False,
+        ).order_by(
+            "host",
+        ).values_list(
+            "host",
+            "website_type_id",
+            "status",
         )
 
+        current_host = None
+        current_verdict = None
+
+        for host, website_type_id, status in websites.iterator(chunk_size=chunk_size):
+            if status == WEBSITE_STATUS_FAKE_SHOP:
+                verdict = VERDICT_FAKE_SHOP
+            elif status == WEBSITE_STATUS_COUNTERFEITER:
+                verdict = VERDICT_COUNTERFEITER
+            elif website_type_id == DB_UNSURE:
+                verdict = VERDICT_UNSURE
+            elif website_type_id == DB_NO_FAKE:
+                verdict = VERDICT_NO_FAKE
+            else:
+                verdict = VERDICT_UNKNOWN
+
+            if host != current_host:
+                if current_host is not None:
+                    yield current_host, current_verdict
+
+                current_host = host
+                current_verdict = verdict
+            elif VERDICTS.index(verdict) < VERDICTS.index(current_verdict):
+                current_verdict = verdict
+
+        if current_host is not None:
+            yield current_host, current_verdict
+
+
+class Website(URLKeyModel, AuthTimeStampedModel):
+    objects = WebsiteQuerySet.as_manager()
+
+    # id of the fake shop or else the counterfeiter assessment of the
+    # website, see `update_website_db_id()`
+    db_id = models.PositiveIntegerField(
+        editable=False,
+        null=True,
+        verbose_name=_("DB ID"),
+    )
 
-class Website(AuthTimeStampedModel):
-    objects = WebsiteManager.from_queryset(WebsiteQuerySet)()
+    url_key = models.CharField(
+        editable=False,
+        max_length=2000,
+        null=True,
+        unique=True,
+        verbose_name=_("URL key"),
+    )
+
+    status = models.CharField(
+        choices=(
+            (WEBSITE_STATUS_OPEN, _("Open")),
+            (WEBSITE_STATUS_FAKE_SHOP, _("Fake shop")),
+            (WEBSITE_STATUS_COUNTERFEITER, _("Brand counterfeiter")),
+        ),
+        default=WEBSITE_STATUS_OPEN,
+        editable=False,
+        max_length=20,
+        verbose_name=_("Status"),
+    )
 
     url = models.CharField(
         help_text=_("Enter url of the reviewing website"),
@@ -233,10 +569,66 @@ class Website(AuthTimeStampedModel):
         verbose_name=_("Website type"),
     )
 
-    screenshot = models.FilePathField(
+    # name in `mal2.utils.screenshot_storage`, content addressed, so websites
+    # with equal screenshots share the files
+    screenshot = models.CharField(
         blank=True,
+        max_length=255,
+        null=True,
+        verbose_name=_("Screenshot"),
+    )
+
+    screenshot_at = models.DateTimeField(
+        db_index=True,
+        editable=False,
+        null=True,
+        verbose_name=_("Screenshot taken at"),
+    )
+
+    # perceptual hash of the screenshot (see `mal2.utils.get_image_hash()`),
+    # the chunk fields are the index of `WebsiteQuerySet.get_similar_screenshots()`
+    screenshot_hash = models.CharField(
+        editable=False,
+        max_length=16,
+        null=True,
+        verbose_name=_("Screenshot hash"),
+    )
+
+    screenshot_hash_0 = models.PositiveIntegerField(
+        db_index=True,
+        editable=False,
+        null=True,
+    )
+
+    screenshot_hash_1 = models.PositiveIntegerField(
+        db_index=True,
+        editable=False,
+        null=True,
+    )
+
+    screenshot_hash_2 = models.PositiveIntegerField(
+        db_index=True,
+        editable=False,
         null=True,
-        path=settings.SCREENSHOTS_PATH,
+    )
+
+    screenshot_hash_3 = models.PositiveIntegerField(
+        db_index=True,
+        editable=False,
+        null=True,
+    )
+
+    # the screenshot is taken in the background, see `ScreenshotJob`
+    screenshot_status = models.CharField(
+        choices=(
+            (SCREENSHOT_STATUS_PENDING, _("Pending")),
+            (SCREENSHOT_STATUS_DONE, _("Done")),
+            (SCREENSHOT_STATUS_FAILED, _("Failed")),
+        ),
+        default=SCREENSHOT_STATUS_PENDING,
+        editable=False,
+        max_length=10,
+        verbose_name=_("Screenshot status"),
     )
 
     website_category = models.ForeignKey(
@@ -252,6 +644,62 @@ class Website(AuthTimeStampedModel):
         verbose_name = _("Website")
         verbose_name_plural = _("Websites")
 
+        indexes = [
+            # keyset pagination of the REST API
+            models.Index(fields=["modified_at", "id"]),
+
+            # queues, see WebsiteQuerySet
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN) & (
+                    Q(website_type__isnull=True)
+                    | Q(website_type=DB_FAKE_SHOP)
+                    | Q(website_type=DB_COUNTERFEITE)
+                ),
+                fields=["id"],
+                name="website_to_check_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN, website_type=DB_NO_VERIFICATION_NECESSARY),
+                fields=["id"],
+                name="website_no_verification_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN, website_type=DB_UNSURE),
+                fields=["id"],
+                name="website_unsure_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN, website_type=DB_NO_FAKE),
+                fields=["id"],
+                name="website_no_fake_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN, website_category=WEBSITE_CATEGORY_OTHER),
+                fields=["id"],
+                name="website_other_sites_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN, website_category=WEBSITE_CATEGORY_ONLINE_SHOP),
+                fields=["id"],
+                name="website_online_shop_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_OPEN),
+                fields=["id"],
+                name="website_open_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_FAKE_SHOP),
+                fields=["id"],
+                name="website_fake_shop_idx",
+            ),
+            models.Index(
+                condition=Q(status=WEBSITE_STATUS_COUNTERFEITER),
+                fields=["id"],
+                name="website_counterfeiter_idx",
+            ),
+        ]
+
         permissions = [
             ("check_website", "Can check website")
         ]
@@ -259,20 +707,35 @@ class Website(AuthTimeStampedModel):
     def __str__(self):
         return remove_url_protocol(self.url)
 
+    def save(self, *args, **kwargs):
+        # both are kept up to date with `update()` by the assessments, the
+        # values of this instance may be outdated
+        self.status = get_website_status(self.url)
+        self.db_id = get_website_db_id(self.pk) if self.pk else None
+
+        update_fields = kwargs.get("update_fields")
+        chunk_fields = get_screenshot_hash_fields(self.screenshot_hash)
+
+        for field, value in chunk_fields.items():
+            setattr(self, field, value)
+
+        if update_fields is not None and "screenshot_hash" in update_fields:
+            kwargs["update_fields"] = list(update_fields) + list(chunk_fields)
+
+        super().save(*args, **kwargs)
+
     def delete(self, *args, **kwargs):
-        name = "%s.png" % self.id
-        screenshot = os.path.join(settings.SCREENSHOTS_PATH, name)
+        result = super().delete(*args, **kwargs)
 
-        if os.path.exists(screenshot):
-            os.remove(screenshot)
+        remove_unused_screenshot(self.screenshot)
 
-        return super().delete(*args, **kwargs)
+        return result
 
 
 ################################################################################
 # FAKESHOP DB
 
-class mal2FakeShopDB(AuthTimeStampedModel):
+class mal2FakeShopDB(WebsiteStatusModel, URLKeyModel, AuthTimeStampedModel):
     website = models.ForeignKey(
         Website,
         blank=True,
@@ -663,6 +1126,11 @@ class mal2FakeShopDB(AuthTimeStampedModel):
         verbose_name = _("Fake shop")
         verbose_name_plural = _("Fake shops")
 
+        # keyset pagination of the REST API
+        indexes = [
+            models.Index(fields=["modified_at", "id"]),
+        ]
+
     def __str__(self):
         return remove_url_protocol(self.url)
 
@@ -670,7 +1138,7 @@ class mal2FakeShopDB(AuthTimeStampedModel):
 ################################################################################
 # BRAND COUNTERFEITER DB
 
-class mal2CounterfeitersDB(AuthTimeStampedModel):
+class mal2CounterfeitersDB(WebsiteStatusModel, URLKeyModel, AuthTimeStampedModel):
     website = models.ForeignKey(
         Website,
         blank=True,
@@ -799,6 +1267,11 @@ class mal2CounterfeitersDB(AuthTimeStampedModel):
         verbose_name = _("Counterfeits DB")
         verbose_name_plural = _("Counterfeits DBS")
 
+        # keyset pagination of the REST API
+        indexes = [
+            models.Index(fields=["modified_at", "id"]),
+        ]
+
     def __str__(self):
         return remove_url_protocol(self.url)
 
@@ -0,0 +1,53 @@
+import os
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from mal2.models import TimeStampedModel
+
+
+################################################################################
+# BLOCKLIST SNAPSHOT
+
+class BlocklistSnapshot(TimeStampedModel):
+    version = models.PositiveIntegerField(
+        unique=True,
+        verbose_name=_("Version"),
+    )
+
+    host_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Host count"),
+    )
+
+    checksum = models.CharField(
+        help_text=_("SHA-256 of the uncompressed snapshot"),
+        max_length=64,
+        verbose_name=_("Checksum"),
+    )
+
+    class Meta:
+        ordering = ("-version",)
+        verbose_name = _("Blocklist snapshot")
+        verbose_name_plural = _("Blocklist snapshots")
+
+    def __str__(self):
+        return str(self.version)
+
+    @property
+    def path(self):
+        return os.path.join(
+            settings.BLOCKLIST_PATH,
+            "blocklist-%s.txt.gz" % self.version,
+        )
+
+    def get_delta_path(self, since_version):
+        """
+        Path of the delta from `since_version` to this version.
+        """
+
+        return os.path.join(
+            settings.BLOCKLIST_PATH,
+            "blocklist-%s-%s.delta.gz" % (since_version, self.version),
+        )
@@ -0,0 +1,128 @@
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import Max
+from django.utils.translation import gettext_lazy as _
+
+from mal2.models.fields import CreationDateTimeField
+from mal2.utils import transaction_lock
+
+
+################################################################################
+# CHANGE FEED
+
+# entries numbered with one query
+BATCH_SIZE = 1000
+
+
+class ChangeFeedEntry(models.Model):
+    """
+    One entry per created, updated or deleted website, fake shop or
+    counterfeiter, written in the transaction of the change. The sequence
+    number is assigned once the entry is committed, see
+    `assign_change_feed_sequence()`.
+
+    Bulk queryset updates and deletes are not listed, except the updates of
+    the status and `db_id` of websites by the fake shop and counterfeiter
+    models. The bookkeeping of the screenshot jobs is not listed either.
+    """
+
+    ACTION_CREATED = "created"
+    ACTION_UPDATED = "updated"
+    ACTION_DELETED = "deleted"
+
+    ACTION_CHOICES = (
+        (ACTION_CREATED, _("Created")),
+        (ACTION_UPDATED, _("Updated")),
+        (ACTION_DELETED, _("Deleted")),
+    )
+
+    id = models.BigAutoField(
+        primary_key=True,
+    )
+
+    sequence = models.BigIntegerField(
+        blank=True,
+        null=True,
+        unique=True,
+        verbose_name=_("Sequence"),
+    )
+
+    created_at = CreationDateTimeField(
+        db_index=True,
+        verbose_name=_("Created at"),
+    )
+
+    model_name = models.CharField(
+        max_length=50,
+        verbose_name=_("Model name"),
+    )
+
+    object_id = models.PositiveIntegerField(
+        verbose_name=_("Object ID"),
+    )
+
+    action = models.CharField(
+        choices=ACTION_CHOICES,
+        max_length=10,
+        verbose_name=_("Action"),
+    )
+
+    # deleted rows are gone, the url identifies them for mirrors
+    url = models.CharField(
+        max_length=2000,
+        null=True,
+        verbose_name=_("URL"),
+    )
+
+    class Meta:
+        ordering = ("id",)
+        verbose_name = _("Change feed entry")
+        verbose_name_plural = _("Change feed entries")
+
+    def __str__(self):
+        return "%s %s %s" % (self.action, self.model_name, self.object_id)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # one numbering after the commit covers all entries of a transaction
+        connection = transaction.get_connection()
+
+        if not any(func is assign_change_feed_sequence for sids, func in connection.run_on_commit):
+            transaction.on_commit(assign_change_feed_sequence)
+
+
+def assign_change_feed_sequence():
+    """
+    Number the committed entries without a sequence number in the order of
+    their ids, called after every commit that wrote entries. Entries of
+    running transactions are not visible yet and get higher numbers later
+    on, so a reader that continues after the last sequence number it has
+    seen never misses an entry. Entries left without number (e.g. after a
+    crash right after the commit) are numbered after the next commit.
+    """
+
+    while True:
+        with transaction.atomic():
+            transaction_lock("change_feed_sequence")
+
+            entries = list(
+                ChangeFeedEntry.objects.filter(
+                    sequence__isnull=True,
+                ).order_by("id").only("id")[:BATCH_SIZE]
+            )
+
+            if not entries:
+                return
+
+            sequence = ChangeFeedEntry.objects.aggregate(
+                sequence=Max("sequence"),
+            )["sequence"] or 0
+
+            for entry in entries:
+                sequence += 1
+                entry.sequence = sequence
+
+            ChangeFeedEntry.objects.bulk_update(entries, ["sequence"])
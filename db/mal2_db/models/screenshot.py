@@ -0,0 +1,133 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from mal2.models import TimeStampedModel
+from mal2_db.models.base import Website
+
+
+################################################################################
+# SCREENSHOT JOB
+
+class ScreenshotJob(TimeStampedModel):
+    """
+    One job per website whose screenshot has to be taken, processed by the
+    "process_screenshots" command. Finished jobs are deleted, failed jobs
+    are kept for inspection.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_RUNNING, _("Running")),
+        (STATUS_FAILED, _("Failed")),
+    )
+
+    website = models.OneToOneField(
+        Website,
+        on_delete=models.CASCADE,
+        related_name="screenshot_job",
+        verbose_name=_("Website"),
+    )
+
+    status = models.CharField(
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        max_length=10,
+        verbose_name=_("Status"),
+    )
+
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Attempts"),
+    )
+
+    # pending jobs wait for their retry and running jobs for their timeout
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Run after"),
+    )
+
+    # replace an existing screenshot, see the "recapture_screenshots" command
+    recapture = models.BooleanField(
+        default=False,
+        verbose_name=_("Recapture"),
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_("Last error"),
+    )
+
+    class Meta:
+        ordering = ("run_after",)
+        verbose_name = _("Screenshot job")
+        verbose_name_plural = _("Screenshot jobs")
+
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return "%s %s" % (self.website_id, self.status)
+
+
+################################################################################
+# WEBSITE FETCH STATE
+
+class WebsiteFetchState(models.Model):
+    """
+    Response of the last successful recapture of a website. A recapture is
+    skipped if a conditional request tells that the page did not change.
+    """
+
+    website = models.OneToOneField(
+        Website,
+        on_delete=models.CASCADE,
+        related_name="fetch_state",
+        verbose_name=_("Website"),
+    )
+
+    status_code = models.PositiveSmallIntegerField(
+        null=True,
+        verbose_name=_("Status code"),
+    )
+
+    etag = models.CharField(
+        blank=True,
+        max_length=255,
+        verbose_name=_("ETag"),
+    )
+
+    last_modified = models.CharField(
+        blank=True,
+        max_length=64,
+        verbose_name=_("Last modified"),
+    )
+
+    # see `mal2.utils.get_html_hash()`
+    content_hash = models.CharField(
+        blank=True,
+        max_length=64,
+        verbose_name=_("Content hash"),
+    )
+
+    checked_at = models.DateTimeField(
+        null=True,
+        verbose_name=_("Checked at"),
+    )
+
+    changed_at = models.DateTimeField(
+        null=True,
+        verbose_name=_("Changed at"),
+    )
+
+    class Meta:
+        verbose_name = _("Website fetch state")
+        verbose_name_plural = _("Website fetch states")
+
+    def __str__(self):
+        return str(self.website_id)
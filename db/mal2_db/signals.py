@@ -0,0 +1,109 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from mal2.utils import invalidate_filter_options
+from mal2_db.models import (
+    ChangeFeedEntry,
+    mal2CounterfeitersDB,
+    mal2FakeShopDB,
+    User,
+    Website,
+    WebsiteCategory,
+    WebsiteReportedBy,
+    WebsiteRiskScore,
+    WebsiteType,
+)
+from mal2_db.utils import add_bloom_filter_hosts
+
+
+################################################################################
+# LOGGER
+
+logger = logging.getLogger(__name__)
+
+
+################################################################################
+# BLOOM FILTER
+
+@receiver(post_save, sender=mal2FakeShopDB)
+@receiver(post_save, sender=mal2CounterfeitersDB)
+def add_host_to_bloom_filter(sender, instance=None, raw=False, **kwargs):
+    if raw or not instance.host:
+        return
+
+    host = instance.host
+
+    def add_host():
+        # a broken filter must not break saving, the next full build fixes it
+        try:
+            add_bloom_filter_hosts([host])
+        except Exception:
+            logger.exception("Adding %s to the bloom filter failed" % host)
+
+    transaction.on_commit(add_host)
+
+
+################################################################################
+# CHANGE FEED
+
+def add_change_feed_entry(instance, action):
+    entry = ChangeFeedEntry(
+        model_name=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+        url=instance.url,
+    )
+
+    # written in the same transaction, so rolled back changes never show up,
+    # the sequence number follows after the commit
+    entry.save()
+
+
+@receiver(post_save, sender=Website)
+@receiver(post_save, sender=mal2FakeShopDB)
+@receiver(post_save, sender=mal2CounterfeitersDB)
+def add_change_feed_entry_on_save(sender, instance=None, created=False, raw=False, **kwargs):
+    if raw:
+        return
+
+    add_change_feed_entry(
+        instance,
+        ChangeFeedEntry.ACTION_CREATED if created else ChangeFeedEntry.ACTION_UPDATED,
+    )
+
+
+@receiver(post_delete, sender=Website)
+@receiver(post_delete, sender=mal2FakeShopDB)
+@receiver(post_delete, sender=mal2CounterfeitersDB)
+def add_change_feed_entry_on_delete(sender, instance=None, **kwargs):
+    add_change_feed_entry(instance, ChangeFeedEntry.ACTION_DELETED)
+
+
+################################################################################
+# FILTER OPTIONS
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=WebsiteCategory)
+@receiver(post_save, sender=WebsiteReportedBy)
+@receiver(post_save, sender=WebsiteRiskScore)
+@receiver(post_save, sender=WebsiteType)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=WebsiteCategory)
+@receiver(post_delete, sender=WebsiteReportedBy)
+@receiver(post_delete, sender=WebsiteRiskScore)
+@receiver(post_delete, sender=WebsiteType)
+def invalidate_filter_options_on_change(sender, update_fields=None, **kwargs):
+    # a login only updates "last_login"
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+
+    # again after the commit, another worker may have cached the old options
+    # in the meantime
+    invalidate_filter_options(sender)
+    transaction.on_commit(lambda: invalidate_filter_options(sender))
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Permission
+from django.db import transaction
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+)
+from rest_framework.test import APIClient
+
+from mal2_db.models import (
+    assign_change_feed_sequence,
+    ChangeFeedEntry,
+    mal2FakeShopDB,
+    User,
+    Website,
+)
+
+
+################################################################################
+# CHANGE FEED
+
+class ChangeFeedTest(TestCase):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    def test_rolled_back_change_is_not_listed(self):
+        try:
+            with transaction.atomic():
+                Website.objects.create(url="https://shop.example.com/")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertFalse(ChangeFeedEntry.objects.exists())
+
+    def test_status_update_is_listed(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        fake_shop = mal2FakeShopDB.objects.create(url=website.url, website=website)
+
+        entries = ChangeFeedEntry.objects.order_by("id").values_list("model_name", "object_id", "action")
+
+        self.assertEqual(list(entries), [
+            ("website", website.id, ChangeFeedEntry.ACTION_CREATED),
+            ("mal2fakeshopdb", fake_shop.id, ChangeFeedEntry.ACTION_CREATED),
+            # status and db_id
+            ("website", website.id, ChangeFeedEntry.ACTION_UPDATED),
+            ("website", website.id, ChangeFeedEntry.ACTION_UPDATED),
+        ])
+
+    def test_sequence_follows_assignment(self):
+        Website.objects.create(url="https://shop1.example.com/")
+        self.assertEqual(ChangeFeedEntry.objects.filter(sequence__isnull=False).count(), 0)
+
+        assign_change_feed_sequence()
+        Website.objects.create(url="https://shop2.example.com/")
+        assign_change_feed_sequence()
+
+        entries = ChangeFeedEntry.objects.order_by("sequence").values_list("sequence", "url")
+
+        self.assertEqual(list(entries), [
+            (1, "https://shop1.example.com/"),
+            (2, "https://shop2.example.com/"),
+        ])
+
+    def test_entries_of_models_without_view_permission_are_not_listed(self):
+        user = User.objects.create(username="reader")
+        user.user_permissions.set(Permission.objects.filter(codename="view_website"))
+
+        website = Website.objects.create(url="https://shop.example.com/")
+        mal2FakeShopDB.objects.create(url=website.url, website=website)
+        assign_change_feed_sequence()
+
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get("/api/v1/changes/", {"format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(entry["model"] for entry in response.data["results"]), {"website"})
+
+
+class ChangeFeedSequenceTest(TransactionTestCase):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    def test_sequence_is_assigned_after_commit(self):
+        with transaction.atomic():
+            website = Website.objects.create(url="https://shop.example.com/")
+            mal2FakeShopDB.objects.create(url=website.url, website=website)
+
+            self.assertFalse(ChangeFeedEntry.objects.filter(sequence__isnull=False).exists())
+
+        sequences = ChangeFeedEntry.objects.order_by("id").values_list("sequence", flat=True)
+
+        self.assertEqual(list(sequences), [1, 2, 3, 4])
@@ -0,0 +1,157 @@
+import io
+import posixpath
+import tempfile
+
+import boto3
+from django.test import (
+    override_settings,
+    TestCase,
+)
+from django.utils.functional import empty
+from moto import mock_s3
+from PIL import Image
+
+from mal2.utils import (
+    get_screenshot_names,
+    save_screenshot,
+    screenshot_storage,
+)
+from mal2_db.models import (
+    remove_unused_screenshot,
+    Website,
+)
+
+
+################################################################################
+# SCREENSHOT STORAGE
+
+def get_png(color):
+    data = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(data, "PNG")
+
+    return data.getvalue()
+
+
+class ScreenshotStorageTestMixin(object):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    storage = None
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        settings_override = override_settings(
+            SCREENSHOT_STORAGE=self.storage,
+            SCREENSHOT_STORAGE_OPTIONS=self.get_storage_options(),
+        )
+        settings_override.enable()
+
+        # the storage is created from the settings on first use
+        screenshot_storage._wrapped = empty
+
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(setattr, screenshot_storage, "_wrapped", empty)
+
+    def get_storage_options(self):
+        return {
+            "location": self.tmp_dir.name,
+        }
+
+    def get_files(self, path=""):
+        directories, files = screenshot_storage.listdir(path)
+        names = [posixpath.join(path, name) for name in files]
+
+        for directory in directories:
+            names.extend(self.get_files(posixpath.join(path, directory)))
+
+        return sorted(names)
+
+    def test_save_screenshot(self):
+        png = get_png("red")
+        name, screenshot_hash = save_screenshot(png)
+
+        self.assertRegex(name, r"^([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.png$")
+        self.assertEqual(self.get_files(), sorted(get_screenshot_names(name)))
+
+        with screenshot_storage.open(name) as f:
+            self.assertEqual(f.read(), png)
+
+        # equal screenshots are stored once
+        self.assertEqual(save_screenshot(png), (name, screenshot_hash))
+        self.assertEqual(self.get_files(), sorted(get_screenshot_names(name)))
+
+        other_name, other_screenshot_hash = save_screenshot(get_png("blue"))
+
+        self.assertNotEqual(other_name, name)
+        self.assertEqual(len(self.get_files()), 6)
+
+    def test_remove_unused_screenshot(self):
+        name, screenshot_hash = save_screenshot(get_png("red"))
+
+        website1 = Website.objects.create(url="https://shop1.example.com/", screenshot=name)
+        website2 = Website.objects.create(url="https://shop2.example.com/", screenshot=name)
+
+        remove_unused_screenshot(name)
+        self.assertEqual(len(self.get_files()), 3)
+
+        website1.delete()
+        self.assertEqual(len(self.get_files()), 3)
+
+        website2.delete()
+        self.assertEqual(self.get_files(), [])
+
+        for screenshot_name in get_screenshot_names(name):
+            self.assertFalse(screenshot_storage.exists(screenshot_name))
+
+
+class ScreenshotFileSystemStorageTest(ScreenshotStorageTestMixin, TestCase):
+    storage = "mal2.utils.ScreenshotFileSystemStorage"
+
+
+class FileSystemStorageTest(ScreenshotStorageTestMixin, TestCase):
+    storage = "django.core.files.storage.FileSystemStorage"
+
+
+class ScreenshotS3StorageTest(ScreenshotStorageTestMixin, TestCase):
+    """
+    Against a stand-in of the S3 API, like MinIO would be used.
+    """
+
+    storage = "mal2.storage.ScreenshotS3Storage"
+
+    def setUp(self):
+        # started here, the decorator would skip the inherited tests
+        s3_mock = mock_s3()
+        s3_mock.start()
+        self.addCleanup(s3_mock.stop)
+
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="screenshots")
+
+        super().setUp()
+
+    def get_storage_options(self):
+        return {
+            "access_key": "access",
+            "bucket_name": "screenshots",
+            "region_name": "us-east-1",
+            "secret_key": "secret",
+        }
+
+    def test_url_is_presigned(self):
+        name, screenshot_hash = save_screenshot(get_png("red"))
+        url = screenshot_storage.url(name)
+
+        self.assertIn(name, url)
+        self.assertIn("Signature", url)
+        self.assertIn("Expires", url)
+
+    def test_files_are_private(self):
+        name, screenshot_hash = save_screenshot(get_png("red"))
+
+        grants = boto3.client("s3", region_name="us-east-1").get_object_acl(
+            Bucket="screenshots",
+            Key=name,
+        )["Grants"]
+
+        self.assertEqual([grant["Permission"] for grant in grants], ["FULL_CONTROL"])
@@ -0,0 +1,187 @@
+from django.db import connection
+from django.test import (
+    RequestFactory,
+    TestCase,
+)
+from django.test.utils import CaptureQueriesContext
+
+from mal2.utils import get_url_host
+from mal2_db.constants import (
+    WEBSITE_STATUS_COUNTERFEITER,
+    WEBSITE_STATUS_FAKE_SHOP,
+    WEBSITE_STATUS_OPEN,
+)
+from mal2_db.forms import WebsiteForm
+from mal2_db.models import (
+    mal2CounterfeitersDB,
+    mal2FakeShopDB,
+    User,
+    Website,
+)
+
+
+def create_legacy_duplicate(url):
+    """
+    Legacy duplicates of an url were left without url key by the migration
+    "0051_fill_url_key".
+    """
+
+    website = Website.objects.create(url="https://duplicate.example.com/")
+    Website.objects.filter(id=website.id).update(url=url, url_key=None, host=get_url_host(url))
+
+    return Website.objects.get(id=website.id)
+
+
+################################################################################
+# URL KEY
+
+class URLKeyTest(TestCase):
+    fixtures = ["init_website_category", "init_website_risc_score", "init_website_types"]
+
+    def test_legacy_duplicate_can_be_saved(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        duplicate = create_legacy_duplicate(website.url)
+
+        duplicate.save()
+        self.assertIsNone(Website.objects.get(id=duplicate.id).url_key)
+
+        # the key is set as soon as the url is unique
+        duplicate.url = "https://other-shop.example.com/"
+        duplicate.save()
+        self.assertEqual(Website.objects.get(id=duplicate.id).url_key, "other-shop.example.com")
+
+    def test_legacy_duplicate_can_be_edited(self):
+        user = User.objects.create(username="editor")
+        request = RequestFactory().post("/")
+        request.user = user
+
+        website = Website.objects.create(url="https://shop.example.com/")
+        duplicate = create_legacy_duplicate(website.url)
+
+        form = WebsiteForm(
+            data={
+                "websiteform-url": duplicate.url,
+                "websiteform-risk_score": 1,
+                "websiteform-assigned_to": user.id,
+                "websiteform-website_category": duplicate.website_category_id,
+            },
+            instance=duplicate,
+            request=request,
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertIsNotNone(form.save())
+
+
+################################################################################
+# WEBSITE STATUS
+
+class WebsiteStatusTest(TestCase):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    def test_status_follows_assessments(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        self.assertEqual(website.status, WEBSITE_STATUS_OPEN)
+
+        counterfeiter = mal2CounterfeitersDB.objects.create(url=website.url, website=website)
+        website.refresh_from_db()
+        self.assertEqual(website.status, WEBSITE_STATUS_COUNTERFEITER)
+
+        fake_shop = mal2FakeShopDB.objects.create(url=website.url, website=website)
+        website.refresh_from_db()
+        self.assertEqual(website.status, WEBSITE_STATUS_FAKE_SHOP)
+
+        fake_shop.delete()
+        counterfeiter.delete()
+        website.refresh_from_db()
+        self.assertEqual(website.status, WEBSITE_STATUS_OPEN)
+
+    def test_status_of_legacy_duplicate_follows_assessments(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        duplicate = create_legacy_duplicate(website.url)
+
+        mal2CounterfeitersDB.objects.create(url=website.url, website=website)
+
+        self.assertEqual(Website.objects.get(id=website.id).status, WEBSITE_STATUS_COUNTERFEITER)
+        self.assertEqual(Website.objects.get(id=duplicate.id).status, WEBSITE_STATUS_COUNTERFEITER)
+
+
+################################################################################
+# WEBSITE DB ID
+
+class WebsiteDBIdTest(TestCase):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    def test_db_id_follows_assessments(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        self.assertIsNone(website.db_id)
+
+        fake_shop = mal2FakeShopDB.objects.create(url=website.url, website=website)
+        website.refresh_from_db()
+        self.assertEqual(website.db_id, fake_shop.id)
+
+        fake_shop.delete()
+        website.refresh_from_db()
+        self.assertIsNone(website.db_id)
+
+    def test_save_of_outdated_website_keeps_db_id(self):
+        """
+        `DBFormMixin.save()` saves the assessment and then the website
+        instance it loaded before.
+        """
+
+        website = Website.objects.create(url="https://shop.example.com/")
+        fake_shop = mal2FakeShopDB.objects.create(url=website.url, website=website)
+
+        self.assertIsNone(website.db_id)
+        website.save()
+
+        self.assertEqual(website.db_id, fake_shop.id)
+        self.assertEqual(Website.objects.get(pk=website.pk).db_id, fake_shop.id)
+        self.assertEqual(Website.objects.get(pk=website.pk).status, WEBSITE_STATUS_FAKE_SHOP)
+
+
+################################################################################
+# WEBSITE QUERIES
+
+class WebsiteQueryTest(TestCase):
+    fixtures = ["init_website_category", "init_website_types"]
+
+    QUEUES = (
+        "to_check",
+        "without_verification",
+        "unsure",
+        "disagreement",
+        "is_fake_shop",
+        "is_brand_counterfeiter",
+        "is_no_fake",
+        "is_other_sites",
+        "is_online_shop",
+    )
+
+    def assertNoAssessmentJoin(self, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            list(queryset)
+            queryset.count()
+
+        for query in queries:
+            for model in (mal2FakeShopDB, mal2CounterfeitersDB):
+                self.assertNotIn(model._meta.db_table, query["sql"])
+
+    def test_queues_need_no_assessment_join(self):
+        for queue in self.QUEUES:
+            with self.subTest(queue=queue):
+                self.assertNoAssessmentJoin(getattr(Website.objects, queue)())
+
+    def test_list_needs_no_join(self):
+        website = Website.objects.create(url="https://shop.example.com/")
+        fake_shop = mal2FakeShopDB.objects.create(url=website.url, website=website)
+
+        with CaptureQueriesContext(connection) as queries:
+            list(Website.objects.all())
+            Website.objects.count()
+
+        for query in queries:
+            self.assertNotIn("JOIN", query["sql"].upper())
+
+        self.assertEqual(list(Website.objects.values_list("db_id", flat=True)), [fake_shop.id])
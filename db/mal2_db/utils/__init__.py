@@ -0,0 +1,4 @@
+from .blocklist import *  # noqa
+from .bloom_filter import *  # noqa
+from .screenshot import *  # noqa
+from .verdict_index import *  # noqa
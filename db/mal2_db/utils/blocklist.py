@@ -0,0 +1,175 @@
+import glob
+import gzip
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+
+from mal2.utils import (
+    file_lock,
+    write_file_atomic,
+)
+from mal2_db.constants.db import (
+    VERDICT_COUNTERFEITER,
+    VERDICT_FAKE_SHOP,
+)
+from mal2_db.models import (
+    BlocklistSnapshot,
+    Website,
+)
+
+
+################################################################################
+# LOGGER
+
+logger = logging.getLogger(__name__)
+
+
+################################################################################
+# BLOCKLIST
+
+BLOCKLIST_VERDICTS = (
+    VERDICT_FAKE_SHOP,
+    VERDICT_COUNTERFEITER,
+)
+
+
+def get_blocklist():
+    """
+    Return a dict with the verdict of every fake shop and counterfeiter host.
+    """
+
+    return {
+        host: verdict
+        for host, verdict in Website.objects.all().iter_host_verdicts()
+        if verdict in BLOCKLIST_VERDICTS
+    }
+
+
+def read_blocklist(path):
+    """
+    Return a dict with the verdict of every host of a snapshot file.
+    """
+
+    blocklist = {}
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            host, verdict = line.split()
+            blocklist[host] = verdict
+
+    return blocklist
+
+
+def get_blocklist_content(blocklist):
+    """
+    A snapshot has one "<host> <verdict>" line per host, sorted by host.
+    """
+
+    return "".join(
+        "%s %s\n" % (host, blocklist[host]) for host in sorted(blocklist)
+    ).encode("utf-8")
+
+
+def get_blocklist_delta_content(old_blocklist, new_blocklist):
+    """
+    A delta has one "+ <host> <verdict>" line per added or changed host and
+    one "- <host>" line per removed host, sorted by host.
+    """
+
+    lines = []
+
+    for host in sorted(old_blocklist.keys() | new_blocklist.keys()):
+        verdict = new_blocklist.get(host)
+
+        if verdict is None:
+            lines.append("- %s\n" % host)
+        elif verdict != old_blocklist.get(host):
+            lines.append("+ %s %s\n" % (host, verdict))
+
+    return "".join(lines).encode("utf-8")
+
+
+def compress(content):
+    # without timestamp the same content always results in the same file
+    return gzip.compress(content, mtime=0)
+
+
+def publish_blocklist(force=False):
+    """
+    Write a new snapshot of the blocklist and the deltas from the previous
+    `BLOCKLIST_DELTA_VERSIONS` versions to it. Returns the new snapshot or
+    None if the blocklist did not change.
+    """
+
+    # concurrent publishes would write the files of the same version, and a
+    # publish waiting for the lock must not publish an older blocklist under
+    # a newer version
+    with file_lock(os.path.join(settings.BLOCKLIST_PATH, "blocklist")):
+        blocklist = get_blocklist()
+        content = get_blocklist_content(blocklist)
+        checksum = hashlib.sha256(content).hexdigest()
+
+        latest_snapshot = BlocklistSnapshot.objects.first()
+
+        if latest_snapshot and latest_snapshot.checksum == checksum and not force:
+            return None
+
+        snapshot = BlocklistSnapshot(
+            version=latest_snapshot.version + 1 if latest_snapshot else 1,
+            host_count=len(blocklist),
+            checksum=checksum,
+        )
+
+        write_file_atomic(snapshot.path, compress(content))
+
+        previous_snapshots = BlocklistSnapshot.objects.filter(
+            version__gte=snapshot.version - settings.BLOCKLIST_DELTA_VERSIONS,
+        )
+
+        for previous_snapshot in previous_snapshots:
+            if not os.path.exists(previous_snapshot.path):
+                continue
+
+            delta_content = get_blocklist_delta_content(
+                read_blocklist(previous_snapshot.path),
+                blocklist,
+            )
+
+            write_file_atomic(
+                snapshot.get_delta_path(previous_snapshot.version),
+                compress(delta_content),
+            )
+
+        # the files have to exist before the snapshot gets visible
+        snapshot.save()
+
+        remove_outdated_blocklist_files(snapshot)
+
+    return snapshot
+
+
+def remove_outdated_blocklist_files(latest_snapshot):
+    """
+    Keep the snapshots of the last `BLOCKLIST_DELTA_VERSIONS` versions and
+    the deltas to the latest version only.
+    """
+
+    outdated_snapshots = BlocklistSnapshot.objects.filter(
+        version__lt=latest_snapshot.version - settings.BLOCKLIST_DELTA_VERSIONS,
+    )
+
+    for snapshot in outdated_snapshots:
+        if os.path.exists(snapshot.path):
+            os.remove(snapshot.path)
+
+    outdated_snapshots.delete()
+
+    delta_paths = glob.glob(
+        os.path.join(settings.BLOCKLIST_PATH, "blocklist-*-*.delta.gz")
+    )
+
+    for delta_path in delta_paths:
+        if not delta_path.endswith("-%s.delta.gz" % latest_snapshot.version):
+            os.remove(delta_path)
@@ -0,0 +1,117 @@
+import logging
+import os
+
+from django.conf import settings
+
+from mal2.utils import (
+    BloomFilter,
+    file_lock,
+    write_file_atomic,
+)
+from mal2_db.models import (
+    mal2CounterfeitersDB,
+    mal2FakeShopDB,
+)
+
+
+################################################################################
+# LOGGER
+
+logger = logging.getLogger(__name__)
+
+
+################################################################################
+# BLOOM FILTER
+
+def get_bloom_filter_hosts():
+    hosts = set()
+
+    for model in (mal2FakeShopDB, mal2CounterfeitersDB):
+        hosts.update(
+            model.objects.filter(
+                host__isnull=False,
+            ).order_by().values_list("host", flat=True).distinct()
+        )
+
+    return hosts
+
+
+def read_bloom_filter():
+    """
+    Return the stored bloom filter or None if it does not exist or can not
+    be read.
+    """
+
+    try:
+        with open(settings.BLOOM_FILTER_PATH, "rb") as f:
+            return BloomFilter.from_bytes(f.read())
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _build_bloom_filter():
+    hosts = get_bloom_filter_hosts()
+
+    bloom_filter = BloomFilter.create(
+        capacity=max(
+            len(hosts) * settings.BLOOM_FILTER_GROWTH,
+            settings.BLOOM_FILTER_MIN_CAPACITY,
+        ),
+        error_rate=settings.BLOOM_FILTER_ERROR_RATE,
+    )
+
+    for host in hosts:
+        bloom_filter.add(host)
+
+    write_file_atomic(settings.BLOOM_FILTER_PATH, bloom_filter.to_bytes())
+
+    return bloom_filter
+
+
+def build_bloom_filter():
+    """
+    Build the bloom filter of all fake shop and counterfeiter hosts from
+    scratch. Hosts of deleted records only leave the filter this way.
+    """
+
+    with file_lock(settings.BLOOM_FILTER_PATH):
+        return _build_bloom_filter()
+
+
+def add_bloom_filter_hosts(hosts):
+    """
+    Add hosts to the stored bloom filter. The filter is built from scratch
+    if it does not exist yet or would exceed its capacity.
+    """
+
+    with file_lock(settings.BLOOM_FILTER_PATH):
+        bloom_filter = read_bloom_filter()
+
+        if bloom_filter is None:
+            return _build_bloom_filter()
+
+        hosts = [host for host in hosts if host and host not in bloom_filter]
+
+        if not hosts:
+            return bloom_filter
+
+        if bloom_filter.item_count + len(hosts) > bloom_filter.capacity:
+            return _build_bloom_filter()
+
+        for host in hosts:
+            bloom_filter.add(host)
+
+        write_file_atomic(settings.BLOOM_FILTER_PATH, bloom_filter.to_bytes())
+
+        return bloom_filter
+
+
+def get_bloom_filter_path():
+    """
+    Return the path of the bloom filter, it is built if it does not exist.
+    """
+
+    if not os.path.exists(settings.BLOOM_FILTER_PATH):
+        build_bloom_filter()
+
+    return settings.BLOOM_FILTER_PATH
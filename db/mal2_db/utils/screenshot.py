@@ -0,0 +1,375 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from mal2.utils import (
+    BrowserPool,
+    get_html_hash,
+    get_response,
+    take_screenshot,
+    transaction_lock,
+)
+from mal2_db.constants.db import (
+    SCREENSHOT_STATUS_DONE,
+    SCREENSHOT_STATUS_FAILED,
+    SCREENSHOT_STATUS_PENDING,
+)
+from mal2_db.models import (
+    remove_unused_screenshot,
+    ScreenshotJob,
+    Website,
+    WebsiteFetchState,
+)
+
+
+################################################################################
+# LOGGER
+
+logger = logging.getLogger(__name__)
+
+
+################################################################################
+# SCREENSHOT JOBS
+
+def enqueue_screenshot(website):
+    """
+    Queue a screenshot of the website, it is taken by the
+    "process_screenshots" command.
+    """
+
+    if website.screenshot_status == SCREENSHOT_STATUS_DONE:
+        return
+
+    ScreenshotJob.objects.update_or_create(
+        website=website,
+        defaults={
+            "status": ScreenshotJob.STATUS_PENDING,
+            "attempts": 0,
+            "run_after": timezone.now(),
+            "last_error": "",
+        },
+    )
+
+    if website.screenshot_status != SCREENSHOT_STATUS_PENDING:
+        Website.objects.filter(id=website.id).update(
+            screenshot_status=SCREENSHOT_STATUS_PENDING,
+        )
+
+        website.screenshot_status = SCREENSHOT_STATUS_PENDING
+
+
+def enqueue_recaptures(websites, batch_size=1000):
+    """
+    Queue new screenshots of the websites that replace the existing ones.
+    Jobs that are already running are left alone. Returns the number of
+    queued jobs.
+    """
+
+    now = timezone.now()
+    count = 0
+
+    website_ids = list(websites.values_list("id", flat=True))
+
+    for i in range(0, len(website_ids), batch_size):
+        batch = website_ids[i:i + batch_size]
+
+        with transaction.atomic():
+            count += ScreenshotJob.objects.filter(
+                website_id__in=batch,
+            ).exclude(
+                status=ScreenshotJob.STATUS_RUNNING,
+            ).update(
+                status=ScreenshotJob.STATUS_PENDING,
+                attempts=0,
+                run_after=now,
+                recapture=True,
+                last_error="",
+                modified_at=now,
+            )
+
+            existing_ids = set(ScreenshotJob.objects.filter(
+                website_id__in=batch,
+            ).values_list("website_id", flat=True))
+
+            jobs = ScreenshotJob.objects.bulk_create([
+                ScreenshotJob(website_id=website_id, run_after=now, recapture=True)
+                for website_id in batch
+                if website_id not in existing_ids
+            ])
+
+            count += len(jobs)
+
+    return count
+
+
+def get_due_screenshot_jobs(now=None):
+    return ScreenshotJob.objects.filter(
+        status__in=(ScreenshotJob.STATUS_PENDING, ScreenshotJob.STATUS_RUNNING),
+        run_after__lte=now or timezone.now(),
+    )
+
+
+def claim_screenshot_job():
+    """
+    Return the next due job marked as running or None. Concurrent workers
+    skip the jobs locked by each other, hosts with
+    `SCREENSHOT_JOB_HOST_CONCURRENCY` running jobs are skipped as well. The
+    running jobs of a host are counted again under a lock per host, without
+    the lock (on databases other than PostgreSQL) the limit is best-effort.
+    """
+
+    while True:
+        now = timezone.now()
+
+        running_host_jobs = ScreenshotJob.objects.filter(
+            status=ScreenshotJob.STATUS_RUNNING,
+            run_after__gt=now,
+            website__host=OuterRef("website__host"),
+        ).order_by().values("website__host").annotate(
+            count=Count("id"),
+        ).values("count")
+
+        with transaction.atomic():
+            job = get_due_screenshot_jobs(now).select_for_update(
+                skip_locked=True,
+                of=("self",),
+            ).annotate(
+                host=F("website__host"),
+                running_host_job_count=Coalesce(
+                    Subquery(running_host_jobs, output_field=IntegerField()),
+                    0,
+                ),
+            ).filter(
+                running_host_job_count__lt=settings.SCREENSHOT_JOB_HOST_CONCURRENCY,
+            ).order_by("run_after").first()
+
+            if job is None:
+                return None
+
+            # row locks do not cover the jobs of the host that are running
+            # already, another worker may claim a job of the same host in
+            # the meantime
+            transaction_lock("screenshot_job_host:%s" % job.host)
+
+            running_count = ScreenshotJob.objects.filter(
+                status=ScreenshotJob.STATUS_RUNNING,
+                run_after__gt=now,
+                website__host=job.host,
+            ).count()
+
+            if running_count < settings.SCREENSHOT_JOB_HOST_CONCURRENCY:
+                job.status = ScreenshotJob.STATUS_RUNNING
+                job.attempts += 1
+                job.run_after = now + timedelta(seconds=settings.SCREENSHOT_JOB_TIMEOUT)
+                job.save(update_fields=["status", "attempts", "run_after", "modified_at"])
+
+                return job
+
+        # the other worker has committed its job, the host is skipped now
+
+
+def fetch_website(website, fetch_state):
+    """
+    Request the website conditionally with the validators of the last
+    recapture. Returns the new fetch state or None if the request failed.
+    """
+
+    headers = {
+        "User-Agent": "Mozilla/20.0.1 (compatible; MSIE 5.5; Windows NT)",
+    }
+
+    if fetch_state.etag:
+        headers["If-None-Match"] = fetch_state.etag
+
+    if fetch_state.last_modified:
+        headers["If-Modified-Since"] = fetch_state.last_modified
+
+    response = get_response(website.url, method="get", headers=headers)
+
+    if response is None or response.status_code >= 400:
+        return None
+
+    now = timezone.now()
+
+    new_fetch_state = WebsiteFetchState(
+        id=fetch_state.id,
+        website=website,
+        status_code=response.status_code,
+        etag=response.headers.get("ETag", fetch_state.etag),
+        last_modified=response.headers.get("Last-Modified", fetch_state.last_modified),
+        content_hash=fetch_state.content_hash,
+        checked_at=now,
+        changed_at=fetch_state.changed_at,
+    )
+
+    if response.status_code != 304:
+        new_fetch_state.content_hash = get_html_hash(response.text)
+
+    if new_fetch_state.content_hash != fetch_state.content_hash:
+        new_fetch_state.changed_at = now
+
+    return new_fetch_state
+
+
+def recapture_screenshot(website, browser_pool=None):
+    """
+    Replace the screenshot of the website unless the page did not change
+    since the last recapture. Returns False if the browser could not load
+    the website.
+    """
+
+    if not settings.SCREENSHOT_SKIP_UNCHANGED:
+        return take_screenshot(website, browser_pool=browser_pool, overwrite=True)
+
+    fetch_state = WebsiteFetchState.objects.filter(website=website).first()
+    fetch_state = fetch_state or WebsiteFetchState(website=website)
+
+    new_fetch_state = fetch_website(website, fetch_state)
+
+    # the browser may still load a page the plain request could not, e.g.
+    # behind a bot protection, the fetch state is kept for the next time
+    if new_fetch_state is None:
+        return take_screenshot(website, browser_pool=browser_pool, overwrite=True)
+
+    unchanged = (
+        website.screenshot
+        and fetch_state.content_hash
+        and new_fetch_state.content_hash == fetch_state.content_hash
+    )
+
+    # the fetch state is only stored with a screenshot of the same page, so a
+    # failed capture is repeated the next time
+    if unchanged or take_screenshot(website, browser_pool=browser_pool, overwrite=True):
+        new_fetch_state.save()
+
+        return True
+
+    return False
+
+
+def process_screenshot_job(job, browser_pool=None):
+    """
+    Take the screenshot of a claimed job. Failed jobs are retried with
+    exponential backoff until `SCREENSHOT_JOB_MAX_ATTEMPTS` is reached.
+    """
+
+    error = ""
+
+    try:
+        website = Website.objects.get(id=job.website_id)
+        old_screenshot = website.screenshot
+
+        if job.recapture:
+            success = recapture_screenshot(website, browser_pool=browser_pool)
+        else:
+            success = take_screenshot(website, browser_pool=browser_pool)
+
+        if not success:
+            error = "Website could not be loaded"
+        elif website.screenshot != old_screenshot:
+            remove_unused_screenshot(old_screenshot)
+    except Exception as e:
+        logger.exception("Screenshot of website %s failed" % job.website_id)
+
+        success = False
+        error = str(e)
+
+    # the job is left alone if it was queued again in the meantime
+    running_job = ScreenshotJob.objects.filter(
+        id=job.id,
+        status=ScreenshotJob.STATUS_RUNNING,
+        attempts=job.attempts,
+    )
+
+    if success:
+        if running_job.delete()[0]:
+            Website.objects.filter(id=job.website_id).update(
+                screenshot_status=SCREENSHOT_STATUS_DONE,
+            )
+    elif job.attempts >= settings.SCREENSHOT_JOB_MAX_ATTEMPTS:
+        # a failed recapture keeps the previous screenshot
+        if running_job.update(status=ScreenshotJob.STATUS_FAILED, last_error=error) and not job.recapture:
+            Website.objects.filter(id=job.website_id).update(
+                screenshot_status=SCREENSHOT_STATUS_FAILED,
+            )
+    else:
+        backoff = settings.SCREENSHOT_JOB_BACKOFF * 2 ** (job.attempts - 1)
+
+        running_job.update(
+            status=ScreenshotJob.STATUS_PENDING,
+            run_after=timezone.now() + timedelta(seconds=backoff),
+            last_error=error,
+        )
+
+    return success
+
+
+def run_screenshot_worker(stop_event, browser_pool, once=False):
+    """
+    Process jobs until `stop_event` is set, or until no job is due if
+    `once` is True. The workers of a process share `browser_pool`.
+    """
+
+    try:
+        while not stop_event.is_set():
+            job = claim_screenshot_job()
+
+            if job is None:
+                # jobs of busy hosts become due as soon as the host is free
+                if once and not get_due_screenshot_jobs().exists():
+                    break
+
+                stop_event.wait(settings.SCREENSHOT_JOB_POLL_INTERVAL)
+                continue
+
+            process_screenshot_job(job, browser_pool=browser_pool)
+    finally:
+        # the thread is not managed by django
+        connection.close()
+
+
+def run_screenshot_workers(concurrency=None, once=False):
+    concurrency = concurrency or settings.SCREENSHOT_JOB_CONCURRENCY
+    stop_event = threading.Event()
+    browser_pool = BrowserPool(size=concurrency)
+
+    threads = [
+        threading.Thread(
+            target=run_screenshot_worker,
+            args=(stop_event, browser_pool, once),
+            name="screenshot-worker-%s" % i,
+            daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_event.set()
+
+        # the running screenshots are finished first
+        for thread in threads:
+            thread.join()
+    finally:
+        browser_pool.close()
@@ -0,0 +1,292 @@
+import heapq
+import logging
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+from hashlib import blake2b
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from mal2_db.constants.db import (
+    VERDICT_COUNTERFEITER,
+    VERDICT_FAKE_SHOP,
+    VERDICT_NO_FAKE,
+    VERDICT_UNKNOWN,
+    VERDICT_UNSURE,
+)
+from mal2_db.models import (
+    mal2CounterfeitersDB,
+    mal2FakeShopDB,
+    Website,
+)
+
+
+################################################################################
+# LOGGER
+
+logger = logging.getLogger(__name__)
+
+
+################################################################################
+# VERDICT INDEX
+
+VERDICT_CODES = {
+    VERDICT_UNKNOWN: 0,
+    VERDICT_FAKE_SHOP: 1,
+    VERDICT_COUNTERFEITER: 2,
+    VERDICT_UNSURE: 3,
+    VERDICT_NO_FAKE: 4,
+}
+
+CODE_VERDICTS = {code: verdict for verdict, code in VERDICT_CODES.items()}
+
+# every entry of the index is a 64 bit integer, the upper 61 bits hold the
+# hash of the host and the lower 3 bits the verdict code
+CODE_MASK = 0b111
+HASH_MASK = 0xFFFFFFFFFFFFFFFF ^ CODE_MASK
+
+ENTRY_SIZE = 8
+DELTA_ENTRY_SIZE = sys.getsizeof(HASH_MASK)
+
+# number of entries that are sorted at once while the index is built
+SORT_CHUNK_SIZE = 100000
+
+# number of hosts per query of the incremental refresh
+QUERY_CHUNK_SIZE = 1000
+
+
+def get_host_hash(host):
+    digest = blake2b(host.encode("utf-8"), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big") & HASH_MASK
+
+
+class VerdictIndex(object):
+    """
+    Compact in-memory index of the verdicts of all website hosts.
+
+    The index is a sorted array of 8 byte entries plus a small dict of hosts
+    that changed since the array was built. It is built in a background
+    thread on first use, refreshed incrementally by `modified_at` and rebuilt
+    from scratch periodically to drop deleted websites. As long as it is not
+    available (not built yet or larger than `VERDICT_INDEX_MAX_SIZE`) the
+    callers have to ask the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # (entries, delta) replaced at once, so readers never see a half
+        # refreshed index
+        self._state = None
+
+        self._modified_since = None
+        self._refreshed_at = None
+        self._rebuilt_at = None
+
+    @property
+    def size(self):
+        """
+        Approximate memory usage in bytes.
+        """
+
+        state = self._state
+
+        if state is None:
+            return 0
+
+        entries, delta = state
+
+        return _get_size(entries, delta)
+
+    def get(self, hosts):
+        """
+        Return a dict with the verdict of every given host or None for hosts
+        without website. Returns None if the index is not available.
+        """
+
+        self.refresh_if_stale()
+
+        state = self._state
+
+        if state is None:
+            return None
+
+        entries, delta = state
+        verdicts = {}
+
+        for host in hosts:
+            host_hash = get_host_hash(host)
+
+            if host_hash in delta:
+                code = delta[host_hash]
+            else:
+                code = _search(entries, host_hash)
+
+            verdicts[host] = CODE_VERDICTS.get(code)
+
+        return verdicts
+
+    def refresh_if_stale(self):
+        if not settings.VERDICT_INDEX_ENABLED:
+            return
+
+        if self._refreshed_at and time.monotonic() - self._refreshed_at < settings.VERDICT_INDEX_REFRESH_INTERVAL:
+            return
+
+        # the lock is released by the refresh thread
+        if not self._lock.acquire(blocking=False):
+            return
+
+        thread = threading.Thread(
+            target=self.refresh,
+            name="verdict-index-refresh",
+            daemon=True,
+        )
+
+        try:
+            thread.start()
+        except Exception:
+            self._lock.release()
+            raise
+
+    def refresh(self):
+        try:
+            if not self._rebuilt_at or time.monotonic() - self._rebuilt_at >= settings.VERDICT_INDEX_REBUILD_INTERVAL:
+                self.rebuild()
+            elif self._state is not None:
+                self.update()
+        except Exception:
+            logger.exception("Refreshing the verdict index failed")
+        finally:
+            # the thread is not managed by django
+            connection.close()
+
+            self._refreshed_at = time.monotonic()
+            self._lock.release()
+
+    def rebuild(self):
+        self._rebuilt_at = time.monotonic()
+
+        modified_since = timezone.now()
+        max_entries = settings.VERDICT_INDEX_MAX_SIZE // ENTRY_SIZE
+
+        chunks = []
+        chunk = []
+        count = 0
+
+        for host, verdict in Website.objects.all().iter_host_verdicts():
+            count += 1
+
+            if count > max_entries:
+                self.disable()
+
+                return
+
+            chunk.append(get_host_hash(host) | VERDICT_CODES[verdict])
+
+            if len(chunk) >= SORT_CHUNK_SIZE:
+                chunks.append(array("Q", sorted(chunk)))
+                chunk = []
+
+        chunks.append(array("Q", sorted(chunk)))
+
+        self._state = (array("Q", heapq.merge(*chunks)), {})
+        self._modified_since = modified_since
+
+        logger.info("Verdict index built with %s hosts (%s bytes)" % (count, self.size))
+
+    def update(self):
+        modified_since = timezone.now()
+        since = self._modified_since - timedelta(seconds=settings.VERDICT_INDEX_REFRESH_OVERLAP)
+
+        hosts = set()
+
+        for model in (Website, mal2FakeShopDB, mal2CounterfeitersDB):
+            hosts.update(
+                model._base_manager.filter(
+                    host__isnull=False,
+                    modified_at__gte=since,
+                ).values_list("host", flat=True)
+            )
+
+        if hosts:
+            entries, delta = self._state
+            delta = dict(delta)
+
+            hosts = sorted(hosts)
+
+            for i in range(0, len(hosts), QUERY_CHUNK_SIZE):
+                chunk = hosts[i:i + QUERY_CHUNK_SIZE]
+                verdicts = dict(
+                    Website.objects.filter(host__in=chunk).iter_host_verdicts()
+                )
+
+                for host in chunk:
+                    verdict = verdicts.get(host)
+                    delta[get_host_hash(host)] = VERDICT_CODES[verdict] if verdict else None
+
+            if len(delta) > settings.VERDICT_INDEX_MAX_DELTA:
+                entries = _merge(entries, delta)
+                delta = {}
+
+            if _get_size(entries, delta) > settings.VERDICT_INDEX_MAX_SIZE:
+                self.disable()
+
+                return
+
+            self._state = (entries, delta)
+
+        self._modified_since = modified_since
+
+    def disable(self):
+        """
+        Drop the index until the next rebuild, the callers fall back to the
+        database in the meantime.
+        """
+
+        self._state = None
+
+        logger.warning(
+            "Verdict index disabled, it exceeds VERDICT_INDEX_MAX_SIZE (%s bytes)"
+            % settings.VERDICT_INDEX_MAX_SIZE
+        )
+
+
+def _get_size(entries, delta):
+    return (
+        len(entries) * ENTRY_SIZE
+        + sys.getsizeof(delta)
+        + len(delta) * DELTA_ENTRY_SIZE
+    )
+
+
+def _search(entries, host_hash):
+    i = bisect_left(entries, host_hash)
+
+    if i < len(entries) and entries[i] & HASH_MASK == host_hash:
+        return entries[i] & CODE_MASK
+
+    return None
+
+
+def _merge(entries, delta):
+    """
+    Merge the changed hosts into a new sorted array. Hosts without website
+    have a code of None in the delta and are removed.
+    """
+
+    kept = (entry for entry in entries if entry & HASH_MASK not in delta)
+    changed = sorted(
+        host_hash | code for host_hash, code in delta.items() if code is not None
+    )
+
+    return array("Q", heapq.merge(kept, changed))
+
+
+verdict_index = VerdictIndex()
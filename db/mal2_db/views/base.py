@@ -1,5 +1,6 @@
 import logging
 
+from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.forms.models import model_to_dict
 from django.http import Http404
@@ -10,6 +11,7 @@ from django.views.generic import RedirectView
 from django.views.generic.detail import SingleObjectMixin
 
 from mal2.constants.data_table import OPTIONS_BOOLEAN
+from mal2.utils import FilterOptions
 from mal2.views.data_table import (
     DataTableDataView,
     DataTableView,
@@ -225,16 +227,12 @@ class AllWebsitesDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -243,23 +241,17 @@ class AllWebsitesDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                     "website_type__type": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteType.objects.all().values_list("type", "type")
-                        ),
+                        "options": FilterOptions(WebsiteType, "type", "type"),
                         "type": "select",
                     },
                     "website_category__category": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteCategory.objects.all().values_list("category", "category")
-                        ),
+                        "options": FilterOptions(WebsiteCategory, "category", "category"),
                         "type": "select",
                     },
                 },
@@ -421,16 +413,12 @@ class WebsitesToCheckDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -439,23 +427,17 @@ class WebsitesToCheckDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                     "website_type__type": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteType.objects.all().values_list("type", "type")
-                        ),
+                        "options": FilterOptions(WebsiteType, "type", "type"),
                         "type": "select",
                     },
                     "website_category__category": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteCategory.objects.all().values_list("category", "category")
-                        ),
+                        "options": FilterOptions(WebsiteCategory, "category", "category"),
                         "type": "select",
                     },
                 },
@@ -590,16 +572,12 @@ class WebsitesWithoutVerificationDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -608,9 +586,7 @@ class WebsitesWithoutVerificationDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                 },
@@ -744,16 +720,12 @@ class WebsitesUnsureDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -762,9 +734,7 @@ class WebsitesUnsureDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                 },
@@ -924,16 +894,12 @@ class WebsitesDisagreementDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -942,9 +908,7 @@ class WebsitesDisagreementDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                 },
@@ -1011,6 +975,19 @@ class EditWebsiteView(PermissionRequiredMixin, AjaxEditView):
         "datatable": True,
     }
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        if self.object.screenshot_hash:
+            context["similar_fake_shops"] = Website.objects.is_fake_shop().exclude(
+                id=self.object.id,
+            ).get_similar_screenshots(
+                self.object.screenshot_hash,
+                settings.SCREENSHOT_SIMILARITY_DISTANCE,
+            )[:settings.SCREENSHOT_SIMILAR_WEBSITES]
+
+        return context
+
 
 ################################################################################
 # DELETE WEBSITE
@@ -1237,16 +1214,12 @@ class FakeShopDataTableMixin(object):
                     },
                     "website__risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "website__assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                 }
@@ -1679,16 +1652,12 @@ class CounterfeitersDataTableMixin(object):
                     },
                     "website__risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "website__assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                 },
@@ -1969,16 +1938,12 @@ class WebsitesNoFakeDataTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -1987,16 +1952,12 @@ class WebsitesNoFakeDataTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                     "website_category__category": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteCategory.objects.all().values_list("category", "category")
-                        ),
+                        "options": FilterOptions(WebsiteCategory, "category", "category"),
                         "type": "select",
                     },
                 },
@@ -2132,16 +2093,12 @@ class WebsitesOtherTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -2150,16 +2107,12 @@ class WebsitesOtherTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                     "website_category__category": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteCategory.objects.all().values_list("category", "category")
-                        ),
+                        "options": FilterOptions(WebsiteCategory, "category", "category"),
                         "type": "select",
                     },
                 },
@@ -2296,16 +2249,12 @@ class WebsitesOnlineShopsTableMixin(object):
                     },
                     "risk_score__risk_score": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteRiskScore.objects.all().values_list("risk_score", "name")
-                        ),
+                        "options": FilterOptions(WebsiteRiskScore, "risk_score", "name"),
                         "type": "select",
                     },
                     "reported_by__reporter": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteReportedBy.objects.all().values_list("reporter", "reporter")
-                        ),
+                        "options": FilterOptions(WebsiteReportedBy, "reporter", "reporter"),
                         "type": "select",
                     },
                     "created_at": {
@@ -2314,16 +2263,12 @@ class WebsitesOnlineShopsTableMixin(object):
                     },
                     "assigned_to__username": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            User.objects.all().values_list("username", "username")
-                        ),
+                        "options": FilterOptions(User, "username", "username"),
                         "type": "select",
                     },
                     "website_category__category": {
                         "classes": "col-6 col-md-2",
-                        "options": list(
-                            WebsiteCategory.objects.all().values_list("category", "category")
-                        ),
+                        "options": FilterOptions(WebsiteCategory, "category", "category"),
                         "type": "select",
                     },
                 },
@@ -1,23 +1,42 @@
 import django_filters
 
+from mal2.utils import get_url_domain
 from mal2_db import models
 
 
+################################################################################
+# DOMAIN
+
+class DomainFilterSet(django_filters.FilterSet):
+    domain = django_filters.CharFilter(method="filter_domain")
+
+    def filter_domain(self, queryset, name, value):
+        # accept domains, subdomains and urls, all of them are reduced to the
+        # registrable domain, e.g. "https://shop1.example.top/de/" matches
+        # everything on "example.top"
+        domain = get_url_domain(value)
+
+        if not domain:
+            return queryset.none()
+
+        return queryset.filter(**{name: domain})
+
+
 ################################################################################
 # WEBSITES
 
-class AllWebsitesFilter(django_filters.FilterSet):
+class AllWebsitesFilter(DomainFilterSet):
     url = django_filters.CharFilter(lookup_expr="icontains")
 
     class Meta:
         model = models.Website
-        fields = ["url", ]
+        fields = ["url", "domain", ]
 
 
 ################################################################################
 # FAKE SHOP DB
 
-class FakeShopDBFilter(django_filters.FilterSet):
+class FakeShopDBFilter(DomainFilterSet):
     url = django_filters.CharFilter(lookup_expr="icontains")
 
     class Meta:
@@ -25,6 +44,7 @@ class FakeShopDBFilter(django_filters.FilterSet):
 
         fields = [
             "url",
+            "domain",
             "website_id",
         ]
 
@@ -32,7 +52,7 @@ class FakeShopDBFilter(django_filters.FilterSet):
 ################################################################################
 # BRAND COUNTETFEITER DB
 
-class BrandCounterfeiterDBFilter(django_filters.FilterSet):
+class BrandCounterfeiterDBFilter(DomainFilterSet):
     url = django_filters.CharFilter(lookup_expr="icontains")
 
     class Meta:
@@ -40,5 +60,6 @@ class BrandCounterfeiterDBFilter(django_filters.FilterSet):
 
         fields = [
             "url",
+            "domain",
             "website_id",
         ]
@@ -0,0 +1,236 @@
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.compat import (
+    coreapi,
+    coreschema,
+)
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    _reverse_ordering,
+)
+
+
+################################################################################
+# KEYSET PAGINATION
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination without "COUNT(*)" and "OFFSET". Ordered by "-id" or
+    by "modified_at, id" with "?ordering=modified_at".
+
+    DRF positions a cursor on the first ordering field only and skips the
+    items with the same value by an offset. The position here holds the
+    values of all ordering fields, the last one is unique, so the cursor is
+    a true keyset and the offset stays 0.
+    """
+
+    orderings = {
+        "-id": ("-id",),
+        "modified_at": ("modified_at", "id"),
+    }
+
+    ordering = orderings["-id"]
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get("ordering", "")
+
+        return self.orderings.get(ordering, self.ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+
+        for order in ordering:
+            field_name = order.lstrip("-")
+
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+
+            values.append(str(value))
+
+        return json.dumps(values)
+
+    def get_position_values(self, queryset, position):
+        """
+        Return the values of the ordering fields of an encoded position.
+        """
+
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            return [
+                queryset.model._meta.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def filter_queryset_by_position(self, queryset, position, reverse):
+        """
+        Return the items after the position, e.g. for "modified_at, id"
+        "modified_at >= a AND (modified_at > a OR (modified_at = a AND
+        id > b))". The leading range lets the index scan start at the
+        position.
+        """
+
+        values = self.get_position_values(queryset, position)
+        conditions = []
+
+        for index, order in enumerate(self.ordering):
+            field_name = order.lstrip("-")
+
+            # (cursor reversed) XOR (ordering reversed)
+            if reverse != order.startswith("-"):
+                lookup = "__lt"
+            else:
+                lookup = "__gt"
+
+            condition = Q(**{field_name + lookup: values[index]})
+
+            for previous_order, value in zip(self.ordering[:index], values):
+                condition &= Q(**{previous_order.lstrip("-"): value})
+
+            conditions.append(condition)
+
+        keyset = reduce(lambda a, b: a | b, conditions)
+
+        if len(self.ordering) > 1:
+            first = self.ordering[0]
+            lookup = "__lte" if reverse != first.startswith("-") else "__gte"
+            keyset = Q(**{first.lstrip("-") + lookup: values[0]}) & keyset
+
+        return queryset.filter(keyset)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # same as `CursorPagination.paginate_queryset()`, but filtered by the
+        # values of all ordering fields
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self.filter_queryset_by_position(queryset, current_position, reverse)
+
+        # one more item tells if there is a following page
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+
+            if self.has_next:
+                self.next_position = current_position
+
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+
+            if self.has_next:
+                self.next_position = following_position
+
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+################################################################################
+# OPTIONAL KEYSET PAGINATION
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """
+    Page number pagination by default. Clients opt in to keyset pagination
+    with "?pagination=cursor" and follow the "next" and "previous" links.
+    """
+
+    pagination_query_param = "pagination"
+    keyset_pagination_class = KeysetPagination
+
+    keyset_paginator = None
+
+    def use_keyset_pagination(self, request):
+        return request.query_params.get(self.pagination_query_param) == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset_pagination(request):
+            self.keyset_paginator = self.keyset_pagination_class()
+
+            return self.keyset_paginator.paginate_queryset(queryset, request, view=view)
+
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_html_context()
+
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.to_html()
+
+        return super().to_html()
+
+    def get_schema_fields(self, view):
+        fields = super().get_schema_fields(view)
+
+        fields.append(coreapi.Field(
+            name=self.pagination_query_param,
+            required=False,
+            location="query",
+            schema=coreschema.String(
+                title="Pagination",
+                description="\"cursor\" for keyset pagination without count, ordered by \"-id\" or by \"modified_at\" with \"ordering=modified_at\".",
+            ),
+        ))
+
+        return fields + self.keyset_pagination_class().get_schema_fields(view)
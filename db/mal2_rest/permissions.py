@@ -17,3 +17,14 @@ class AllowPostMethod(CustomDjangoModelPermissions):
             return True
 
         return super().has_permission(request, view)
+
+
+class ViewPermissionsForPostMethod(CustomDjangoModelPermissions):
+    """
+    For read only endpoints that take their parameters as POST data.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.perms_map["POST"] = self.perms_map["GET"]
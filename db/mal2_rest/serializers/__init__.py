@@ -1,2 +1,4 @@
 from .base import *  # noqa
+from .change_feed import *  # noqa
+from .lookup import *  # noqa
 from .user import *  # noqa
@@ -1,9 +1,14 @@
 from django.core import validators as django_validators
+from django.db import (
+    IntegrityError,
+    transaction,
+)
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
-from mal2.utils import take_screenshot
 from mal2_db import models
 from mal2_db.models import WebsiteCategory
+from mal2_db.utils import enqueue_screenshot
 from mal2_rest import validators
 
 
@@ -39,7 +44,7 @@ class WebsiteTypeSerializer(serializers.ModelSerializer):
 
 class WebsiteSerializer(serializers.ModelSerializer):
     db_id = serializers.IntegerField(
-        required=False,
+        read_only=True,
     )
 
     url = serializers.CharField(
@@ -61,6 +66,7 @@ class WebsiteSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "website_type",
             "screenshot",
+            "screenshot_status",
             "website_category",
         ]
 
@@ -74,8 +80,17 @@ class WebsiteSerializer(serializers.ModelSerializer):
         }
 
     def create(self, validated_data):
-        website = super().create(validated_data)
-        take_screenshot(website)
+        # the duplicate check of the url validator can not prevent concurrent
+        # requests with the same url, the unique url key has the last word
+        try:
+            with transaction.atomic():
+                website = super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                "url": [_("URL already exists in the database!")],
+            })
+
+        enqueue_screenshot(website)
 
         return website
 
@@ -0,0 +1,56 @@
+from rest_framework import serializers
+
+from mal2_db import models
+from mal2_rest.serializers.base import (
+    BrandCounterfeiterDBSerializer,
+    FakeShopDBSerializer,
+    WebsiteSerializer,
+)
+
+
+################################################################################
+# CHANGE FEED
+
+class ChangeFeedEntrySerializer(serializers.ModelSerializer):
+    data_serializer_classes = {
+        "website": WebsiteSerializer,
+        "mal2fakeshopdb": FakeShopDBSerializer,
+        "mal2counterfeitersdb": BrandCounterfeiterDBSerializer,
+    }
+
+    model = serializers.CharField(
+        source="model_name",
+    )
+
+    data = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.ChangeFeedEntry
+
+        fields = [
+            "sequence",
+            "created_at",
+            "model",
+            "object_id",
+            "action",
+            "url",
+            "data",
+        ]
+
+    def get_data(self, entry):
+        """
+        Current state of the row, None for deleted rows. The rows are
+        fetched in bulk by the view and passed in the "objects" context.
+        """
+
+        if entry.action == models.ChangeFeedEntry.ACTION_DELETED:
+            return None
+
+        instance = self.context["objects"].get((entry.model_name, entry.object_id))
+
+        if instance is None:
+            return None
+
+        serializer_class = self.data_serializer_classes[entry.model_name]
+
+        return serializer_class(instance, context=self.context).data
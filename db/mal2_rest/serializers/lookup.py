@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from mal2_db.constants.db import VERDICTS
+
+
+################################################################################
+# LOOKUP
+
+class LookupSerializer(serializers.Serializer):
+    urls = serializers.ListField(
+        allow_empty=False,
+        child=serializers.CharField(
+            max_length=2000,
+        ),
+        max_length=settings.LOOKUP_MAX_URLS,
+    )
+
+
+class LookupResultSerializer(serializers.Serializer):
+    url = serializers.CharField()
+    host = serializers.CharField(
+        allow_null=True,
+    )
+    verdict = serializers.ChoiceField(
+        choices=VERDICTS,
+    )
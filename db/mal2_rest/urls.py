@@ -31,6 +31,11 @@ urlpatterns = [
     re_path(r"^(?P<version>(v1))/permission/group/$", views.GroupsListView.as_view()),
     re_path(r"^(?P<version>(v1))/permission/group/(?P<pk>\d+)$", views.GroupsListView.as_view()),
 
+    re_path(r"^(?P<version>(v1))/lookup/$", views.LookupView.as_view()),
+    re_path(r"^(?P<version>(v1))/blocklist/$", views.BlocklistView.as_view()),
+    re_path(r"^(?P<version>(v1))/bloom_filter/$", views.BloomFilterView.as_view()),
+    re_path(r"^(?P<version>(v1))/changes/$", views.ChangeFeedView.as_view()),
+
     re_path(r"^(?P<version>(v1))/website/$", views.AllWebsitesListView.as_view()),
     re_path(r"^(?P<version>(v1))/website/(?P<pk>\d+)$", views.AllWebsitesDetailView.as_view()),
 
@@ -1,22 +1,31 @@
-from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 
-from mal2.utils import remove_url_protocol
+from mal2.utils import (
+    get_url_host,
+    get_url_key,
+)
 from mal2_db.models import Website
+from mal2_db.utils import verdict_index
 
 
 class DuplicateURLValidator(object):
     def __call__(self, url):
-        url.strip("/")
-        url_to_check = remove_url_protocol(url)
+        url_key = get_url_key(url)
 
-        website = Website.objects.filter(
-            Q(url="http://%s" % url_to_check)
-            | Q(url="https://%s" % url_to_check)
-        ).first()
+        if not url_key:
+            return
 
-        if website:
+        # the url key starts with the host, so there is no duplicate if the
+        # in-memory index knows no website with this host (websites added
+        # since the last refresh are caught by the unique url key)
+        host = get_url_host(url)
+        verdicts = verdict_index.get([host])
+
+        if verdicts is not None and verdicts[host] is None:
+            return
+
+        if Website.objects.filter(url_key=url_key).exists():
             raise exceptions.ValidationError(
                 _("URL already exists in the database!"),
                 code="invalid",
@@ -1,3 +1,6 @@
 from .base import *  # noqa
+from .blocklist import *  # noqa
+from .change_feed import *  # noqa
+from .lookup import *  # noqa
 from .token import *  # noqa
 from .user import *  # noqa
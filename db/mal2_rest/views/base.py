@@ -10,6 +10,7 @@ from mal2_rest import (
     filters,
     serializers,
 )
+from mal2_rest.pagination import OptionalKeysetPagination
 from mal2_rest.permissions import AllowPostMethod
 
 
@@ -112,7 +113,8 @@ class WebsitesMixin(object):
 
 class WebsitesListMixin(WebsitesMixin):
     filterset_class = filters.AllWebsitesFilter
-    filterset_fields = ["url", "website_type", "website_category", ]
+    filterset_fields = ["url", "domain", "website_type", "website_category", ]
+    pagination_class = OptionalKeysetPagination
 
 
 class AllWebsitesListView(WebsitesListMixin, CreateModelMixin, ListModelMixin, GenericAPIView):
@@ -261,7 +263,8 @@ class FakeShopDBListView(FakeShopDBMixin, ListModelMixin, GenericAPIView):
     """
 
     filterset_class = filters.FakeShopDBFilter
-    filterset_fields = ["url", ]
+    filterset_fields = ["url", "domain", ]
+    pagination_class = OptionalKeysetPagination
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -298,7 +301,8 @@ class BrandCounterfeiterDBListView(BrandCounterfeiterDBMixin, ListModelMixin, Ge
     """
 
     filterset_class = filters.BrandCounterfeiterDBFilter
-    filterset_fields = ["url", ]
+    filterset_fields = ["url", "domain", ]
+    pagination_class = OptionalKeysetPagination
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -0,0 +1,88 @@
+import os
+
+from django.http import HttpResponseNotModified
+from rest_framework.exceptions import NotFound
+from rest_framework.views import APIView
+
+from mal2.views import SendFileMixin
+from mal2_db import models
+from mal2_db.utils import get_bloom_filter_path
+
+
+################################################################################
+# BLOCKLIST
+
+class BlocklistView(SendFileMixin, APIView):
+    """
+    get:
+    Return the latest blocklist snapshot, a gzip compressed text file with one
+    "<host> <verdict>" line per fake shop or counterfeiter host, sorted by
+    host. The version is sent in the "X-Blocklist-Version" and "ETag" headers.
+
+    With "?since=<version>" the delta from this version to the latest one is
+    returned if available: one "+ <host> <verdict>" line per added or changed
+    host and one "- <host>" line per removed host. The "X-Blocklist-Type"
+    header is "delta" or "snapshot" if the delta is not available anymore.
+    """
+
+    queryset = models.Website.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        snapshot = models.BlocklistSnapshot.objects.first()
+
+        if snapshot is None:
+            raise NotFound()
+
+        etag = "\"%s\"" % snapshot.version
+        since = request.query_params.get("since", "")
+
+        if since == str(snapshot.version):
+            http_response = HttpResponseNotModified()
+            http_response["ETag"] = etag
+        else:
+            path = snapshot.path
+            blocklist_type = "snapshot"
+
+            if since.isdigit() and os.path.exists(snapshot.get_delta_path(since)):
+                path = snapshot.get_delta_path(since)
+                blocklist_type = "delta"
+
+            if not os.path.exists(path):
+                raise NotFound()
+
+            # "If-None-Match" and "If-Range" are checked against the version,
+            # "If-Modified-Since" against the time the file was published
+            http_response = self.get_file_response(
+                path,
+                content_type="application/gzip",
+                etag=etag,
+            )
+
+            if http_response.status_code in (200, 206):
+                http_response["X-Blocklist-Type"] = blocklist_type
+
+        http_response["X-Blocklist-Version"] = snapshot.version
+
+        return http_response
+
+
+################################################################################
+# BLOOM FILTER
+
+class BloomFilterView(SendFileMixin, APIView):
+    """
+    get:
+    Return a bloom filter of all fake shop and counterfeiter hosts. Clients
+    check the normalized host (lower case, IDNA encoded, without "www.") of
+    an url against the filter and only ask the REST API on a hit. See
+    `mal2.utils.BloomFilter` for the binary format.
+    """
+
+    queryset = models.Website.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        # every change replaces the file, which changes its ETag
+        return self.get_file_response(
+            get_bloom_filter_path(),
+            content_type="application/octet-stream",
+        )
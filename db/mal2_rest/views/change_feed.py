@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from mal2_db import models
+from mal2_rest import serializers
+
+
+################################################################################
+# CHANGE FEED
+
+class ChangeFeedView(GenericAPIView):
+    """
+    get:
+    Return created, updated and deleted websites, fake shops and brand
+    counterfeiters in commit order, only of the models the user may view.
+    "since" is the "cursor" (sequence number) of the previous response or an
+    ISO 8601 timestamp. Follow "next" until it is empty and continue with
+    "cursor" later on. "data" holds the current state of the row and is
+    empty for deleted rows.
+    """
+
+    queryset = models.Website.objects.all()
+    serializer_class = serializers.ChangeFeedEntrySerializer
+    pagination_class = None
+
+    data_querysets = {
+        "website": models.Website.objects.all(),
+        "mal2fakeshopdb": models.mal2FakeShopDB.objects.prefetch_related(
+            "company_name",
+            "language_example",
+            "website_image",
+            "website_text",
+            "search_result",
+        ),
+        "mal2counterfeitersdb": models.mal2CounterfeitersDB.objects.prefetch_related(
+            "language_url",
+            "product_example",
+        ),
+    }
+
+    def get_model_names(self):
+        """
+        Only the changes of the models the user may view are listed.
+        """
+
+        return [
+            model_name for model_name, queryset in self.data_querysets.items()
+            if self.request.user.has_perm("%s.view_%s" % (queryset.model._meta.app_label, model_name))
+        ]
+
+    def get_entries(self, since):
+        entries = models.ChangeFeedEntry.objects.filter(
+            model_name__in=self.get_model_names(),
+            sequence__isnull=False,
+        )
+
+        if since.isdigit():
+            entries = entries.filter(sequence__gt=int(since))
+        elif since:
+            since_datetime = parse_datetime(since)
+
+            if since_datetime is None:
+                raise ValidationError({
+                    "since": [_("Enter a sequence number or an ISO 8601 timestamp.")],
+                })
+
+            if timezone.is_naive(since_datetime):
+                since_datetime = timezone.make_aware(since_datetime)
+
+            entries = entries.filter(created_at__gte=since_datetime)
+
+        return list(entries.order_by("sequence")[:settings.CHANGE_FEED_PAGE_SIZE])
+
+    def get_objects(self, entries):
+        """
+        Fetch the changed rows with one query per model.
+        """
+
+        object_ids = {}
+
+        for entry in entries:
+            if entry.action != models.ChangeFeedEntry.ACTION_DELETED:
+                object_ids.setdefault(entry.model_name, set()).add(entry.object_id)
+
+        objects = {}
+
+        for model_name, ids in object_ids.items():
+            for instance in self.data_querysets[model_name].filter(id__in=ids):
+                objects[(model_name, instance.id)] = instance
+
+        return objects
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["objects"] = getattr(self, "objects", {})
+
+        return context
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get("since", "")
+        entries = self.get_entries(since)
+
+        self.objects = self.get_objects(entries)
+
+        serializer = self.get_serializer(entries, many=True)
+
+        if entries:
+            cursor = entries[-1].sequence
+        elif since.isdigit():
+            cursor = int(since)
+        else:
+            cursor = None
+
+        if len(entries) == settings.CHANGE_FEED_PAGE_SIZE:
+            next_url = replace_query_param(request.build_absolute_uri(), "since", cursor)
+        else:
+            next_url = None
+
+        return Response({
+            "cursor": cursor,
+            "next": next_url,
+            "results": serializer.data,
+        })
@@ -0,0 +1,53 @@
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from mal2.utils import get_url_host
+from mal2_db import models
+from mal2_db.constants.db import VERDICT_UNKNOWN
+from mal2_db.utils import verdict_index
+from mal2_rest import serializers
+from mal2_rest.permissions import ViewPermissionsForPostMethod
+
+
+################################################################################
+# LOOKUP
+
+class LookupView(GenericAPIView):
+    """
+    post:
+    Return the verdict (fake_shop, counterfeiter, unsure, no_fake or unknown)
+    of every given url. The urls are matched by their normalized host.
+    """
+
+    queryset = models.Website.objects.all()
+    serializer_class = serializers.LookupSerializer
+
+    permission_classes = [
+        ViewPermissionsForPostMethod,
+    ]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        urls = serializer.validated_data["urls"]
+        hosts = [get_url_host(url) for url in urls]
+
+        valid_hosts = set(host for host in hosts if host)
+
+        # the in-memory index answers without database query as soon as it
+        # is available in this process
+        verdicts = verdict_index.get(valid_hosts)
+
+        if verdicts is None:
+            verdicts = self.get_queryset().get_verdicts(valid_hosts)
+
+        results = serializers.LookupResultSerializer([
+            {
+                "url": url,
+                "host": host,
+                "verdict": verdicts.get(host) or VERDICT_UNKNOWN,
+            } for url, host in zip(urls, hosts)
+        ], many=True)
+
+        return Response({"results": results.data})